@@ -0,0 +1,288 @@
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import struct
+import sys
+import tempfile
+from datetime import datetime
+from colorama import Fore, Style
+
+INDEX_DIR = "breach_index"
+PROVIDER = "Offline corpus"
+
+KEYS_FILE = "keys.bin"
+BLOOM_FILE = "bloom.bin"
+META_FILE = "meta.json"
+
+# Each record is an 8-byte hashed email followed by a 4-byte source id, so
+# sorting the raw bytes sorts by key and duplicates sit next to each other.
+KEY_SIZE = 8
+RECORD_SIZE = KEY_SIZE + 4
+CHUNK_RECORDS = 2_000_000   # records sorted in memory per run (~24 MB)
+BLOOM_FP_RATE = 0.001
+MAX_BLOOM_HASHES = 7
+
+# Dump lines start with the address, then any of : ; , | tab or space
+DUMP_EMAIL = re.compile(rb"^\s*([^@\s:;,|\"']+@[^@\s:;,|\"']+\.[A-Za-z0-9-]+)")
+
+
+# ---------------------------
+#  Hashing
+# ---------------------------
+def email_key(email):
+    """8-byte key for an address; the raw address is never stored."""
+    normalized = email.strip().lower().encode("utf-8") if isinstance(email, str) else email.strip().lower()
+    return hashlib.blake2b(normalized, digest_size=KEY_SIZE).digest()
+
+
+def _bloom_positions(key, bits, hashes):
+    # Double hashing from the two halves of the key
+    h1, h2 = struct.unpack(">II", key)
+    h2 |= 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def _bloom_size(records, fp_rate=BLOOM_FP_RATE):
+    records = max(records, 1)
+    bits = max(64, int(-records * math.log(fp_rate) / (math.log(2) ** 2)))
+    hashes = max(1, min(MAX_BLOOM_HASHES, round(bits / records * math.log(2))))
+    return bits, hashes
+
+
+# ---------------------------
+#  Ingestion
+# ---------------------------
+def _read_meta(index_dir):
+    path = os.path.join(index_dir, META_FILE)
+    if not os.path.exists(path):
+        return {"sources": [], "records": 0}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _source_id(meta, name, date, fields):
+    for i, source in enumerate(meta["sources"]):
+        if source["name"] == name:
+            source["fields"] = sorted(set(source["fields"]) | set(fields))
+            return i
+    meta["sources"].append({"name": name, "date": date, "fields": sorted(set(fields))})
+    return len(meta["sources"]) - 1
+
+
+def _write_run(records, tmpdir):
+    records.sort()
+    fd, path = tempfile.mkstemp(dir=tmpdir, suffix=".run")
+    with os.fdopen(fd, "wb") as f:
+        f.write(b"".join(records))
+    return path
+
+
+def _read_records(path):
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(RECORD_SIZE * 8192)
+            if not block:
+                return
+            for i in range(0, len(block), RECORD_SIZE):
+                yield block[i:i + RECORD_SIZE]
+
+
+def _dump_runs(dump, source_id, tmpdir, chunk_records):
+    """Split one dump into sorted run files; returns (run paths, lines indexed)."""
+    tag = struct.pack(">I", source_id)
+    runs = []
+    records = []
+    indexed = 0
+    with open(dump, "rb") as f:
+        for line in f:
+            match = DUMP_EMAIL.match(line)
+            if not match:
+                continue
+            records.append(email_key(match.group(1)) + tag)
+            indexed += 1
+            if len(records) >= chunk_records:
+                runs.append(_write_run(records, tmpdir))
+                records = []
+    if records:
+        runs.append(_write_run(records, tmpdir))
+    return runs, indexed
+
+
+def build_index(dumps, index_dir=INDEX_DIR, chunk_records=CHUNK_RECORDS, fp_rate=BLOOM_FP_RATE):
+    """Add credential dumps to the on-disk index, merging with anything already there.
+
+    ``dumps`` holds file paths or dicts with "path" and optional "name", "date"
+    and "fields" (what the dump exposes, e.g. ["email", "password"]). Dumps
+    are sorted in bounded runs and merged, so memory stays flat whatever
+    their size.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    meta = _read_meta(index_dir)
+    keys_path = os.path.join(index_dir, KEYS_FILE)
+    tmpdir = tempfile.mkdtemp(dir=index_dir)
+    try:
+        runs = [keys_path] if os.path.exists(keys_path) else []
+        for dump in dumps:
+            if isinstance(dump, str):
+                dump = {"path": dump}
+            name = dump.get("name") or os.path.splitext(os.path.basename(dump["path"]))[0]
+            source_id = _source_id(meta, name, dump.get("date"), dump.get("fields") or ["email"])
+            print(f"📥 Indexing {dump['path']} as {Fore.CYAN}{name}{Style.RESET_ALL}...")
+            dump_runs, indexed = _dump_runs(dump["path"], source_id, tmpdir, chunk_records)
+            runs += dump_runs
+            print(f"   {indexed} addresses read")
+
+        # Upper bound on the merged size, used to size the bloom filter
+        total = sum(os.path.getsize(path) for path in runs) // RECORD_SIZE
+        bits, hashes = _bloom_size(total, fp_rate)
+        bloom = bytearray((bits + 7) // 8)
+
+        records = 0
+        previous = None
+        merged_path = os.path.join(tmpdir, KEYS_FILE)
+        with open(merged_path, "wb") as out:
+            for record in heapq.merge(*(_read_records(path) for path in runs)):
+                if record == previous:
+                    continue
+                out.write(record)
+                records += 1
+                key = record[:KEY_SIZE]
+                if previous is None or key != previous[:KEY_SIZE]:
+                    for bit in _bloom_positions(key, bits, hashes):
+                        bloom[bit >> 3] |= 1 << (bit & 7)
+                previous = record
+
+        bloom_path = os.path.join(tmpdir, BLOOM_FILE)
+        with open(bloom_path, "wb") as f:
+            f.write(bloom)
+        os.replace(merged_path, keys_path)
+        os.replace(bloom_path, os.path.join(index_dir, BLOOM_FILE))
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    meta.update({"records": records, "bloom_bits": bits, "bloom_hashes": hashes,
+                 "updated_at": datetime.utcnow().isoformat()})
+    with open(os.path.join(index_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=4)
+    print(f"{Fore.GREEN}✅ Index holds {records} records from {len(meta['sources'])} sources{Style.RESET_ALL}")
+    return meta
+
+
+# ---------------------------
+#  Lookup
+# ---------------------------
+class BreachIndex:
+    """Read-only view of an index built by build_index, memory-mapped on first use."""
+
+    def __init__(self, index_dir=INDEX_DIR):
+        self.index_dir = index_dir
+        self.meta = None
+        self._keys = None
+        self._bloom = None
+        self._files = []
+        self.count = 0
+
+    def available(self):
+        return os.path.exists(os.path.join(self.index_dir, META_FILE))
+
+    def _open(self):
+        if self.meta is not None:
+            return
+        self.meta = _read_meta(self.index_dir)
+        self._keys = self._map(KEYS_FILE)
+        self._bloom = self._map(BLOOM_FILE)
+        self.count = len(self._keys) // RECORD_SIZE if self._keys else 0
+
+    def _map(self, name):
+        path = os.path.join(self.index_dir, name)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        f = open(path, "rb")
+        self._files.append(f)
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        for m in (self._keys, self._bloom):
+            if m is not None:
+                m.close()
+        for f in self._files:
+            f.close()
+        self.meta = self._keys = self._bloom = None
+        self._files = []
+        self.count = 0
+
+    def _maybe_contains(self, key):
+        if self._bloom is None:
+            return self.count > 0
+        bloom = self._bloom
+        for bit in _bloom_positions(key, self.meta["bloom_bits"], self.meta["bloom_hashes"]):
+            if not bloom[bit >> 3] & (1 << (bit & 7)):
+                return False
+        return True
+
+    def source_ids(self, email):
+        """Ids of every source that holds ``email``."""
+        self._open()
+        key = email_key(email)
+        if not self.count or not self._maybe_contains(key):
+            return []
+        keys = self._keys
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = mid * RECORD_SIZE
+            if keys[start:start + KEY_SIZE] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        ids = []
+        while lo < self.count:
+            start = lo * RECORD_SIZE
+            if keys[start:start + KEY_SIZE] != key:
+                break
+            ids.append(struct.unpack(">I", keys[start + KEY_SIZE:start + RECORD_SIZE])[0])
+            lo += 1
+        return ids
+
+    def lookup(self, email):
+        """Same result dict as email_breach.leakcheck_lookup_async, answered from disk."""
+        sources = [self.meta["sources"][i] for i in self.source_ids(email)]
+        fields = sorted({field for source in sources for field in source["fields"]})
+        return {
+            "email": email,
+            "checked_at": datetime.utcnow().isoformat(),
+            "provider": PROVIDER,
+            "status": "found" if sources else "not_found",
+            "found": len(sources),
+            "fields": fields,
+            "sources": [{"name": s["name"], "date": s["date"]} for s in sources]
+        }
+
+
+_index = None
+
+
+def get_index(index_dir=INDEX_DIR):
+    global _index
+    if _index is None or _index.index_dir != index_dir:
+        _index = BreachIndex(index_dir)
+    return _index
+
+
+def lookup(email, index_dir=INDEX_DIR):
+    return get_index(index_dir).lookup(email)
+
+
+# ---------------------------
+#  Main
+# ---------------------------
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        build_index(sys.argv[1:])
+    else:
+        print("Usage: python breach_index.py DUMP [DUMP ...]")
@@ -0,0 +1,309 @@
+import asyncio
+import ipaddress
+import socket
+import threading
+import time
+from concurrent.futures import Future
+
+import dns.asyncresolver
+import dns.resolver
+import dns.reversename
+from aiohttp.abc import AbstractResolver
+
+DNS_LIFETIME = 5
+NEGATIVE_TTL = 300          # NXDOMAIN / no-answer results
+MAX_ENTRIES = 100000
+
+
+# ---------------------------
+#  Caching Resolver
+# ---------------------------
+class CachingResolver:
+    """Thread-safe dnspython wrapper that caches answers for their record TTL.
+
+    NXDOMAIN and empty answers are cached for NEGATIVE_TTL; timeouts and
+    server failures are not cached. Concurrent lookups of the same
+    (name, type) share one query.
+    """
+
+    def __init__(self, lifetime=DNS_LIFETIME, negative_ttl=NEGATIVE_TTL, max_entries=MAX_ENTRIES):
+        self.lifetime = lifetime
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._resolver = dns.resolver.Resolver()
+        self._aresolver = dns.asyncresolver.Resolver()
+        self._cache = {}
+        self._inflight = {}
+        self._ainflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def resolve(self, name, rtype="A"):
+        """Return the answers as text, or [] if the name has none (or the lookup failed)."""
+        key = _key(name, rtype)
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                return cached
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            answers = self._resolver.resolve(key[0], key[1], lifetime=self.lifetime)
+            value, expires = self._answer(answers)
+        except Exception as e:
+            value, expires = self._failure(e)
+
+        with self._lock:
+            if expires is not None:
+                self._store(key, expires, value)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+    async def aresolve(self, name, rtype="A"):
+        """Native asyncio variant of resolve() sharing the same cache."""
+        key = _key(name, rtype)
+        loop = asyncio.get_running_loop()
+        # asyncio futures belong to one loop, so coalescing is per loop
+        flight_key = (id(loop), key)
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                return cached
+            future = self._ainflight.get(flight_key)
+            owner = future is None
+            if owner:
+                future = self._ainflight[flight_key] = loop.create_future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return await asyncio.shield(future)
+
+        try:
+            answers = await self._aresolver.resolve(key[0], key[1], lifetime=self.lifetime)
+            value, expires = self._answer(answers)
+        except asyncio.CancelledError:
+            # Release the waiters with an uncached empty answer
+            with self._lock:
+                del self._ainflight[flight_key]
+            future.set_result([])
+            raise
+        except Exception as e:
+            value, expires = self._failure(e)
+
+        with self._lock:
+            if expires is not None:
+                self._store(key, expires, value)
+            del self._ainflight[flight_key]
+        future.set_result(value)
+        return value
+
+    def settled(self, name, rtype="A"):
+        """True if (name, rtype) has a fresh cached answer, so an empty result is authoritative
+        (NXDOMAIN / no records) rather than a failed lookup."""
+        entry = self._cache.get(_key(name, rtype))
+        return bool(entry and entry[0] > time.time())
+
+    def _lookup(self, key):
+        entry = self._cache.get(key)
+        if entry and entry[0] > time.time():
+            self.hits += 1
+            return entry[1]
+        return None
+
+    def _answer(self, answers):
+        return [str(a.to_text()) for a in answers], answers.expiration
+
+    def _failure(self, error):
+        if isinstance(error, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)):
+            return [], time.time() + self.negative_ttl
+        # Timeouts and server failures are worth retrying, so they are not cached
+        return [], None
+
+    def _store(self, key, expires, value):
+        if len(self._cache) >= self.max_entries:
+            now = time.time()
+            for k in [k for k, (exp, _) in self._cache.items() if exp <= now]:
+                del self._cache[k]
+            # Still full: drop the oldest insertions
+            while len(self._cache) >= self.max_entries:
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = (expires, value)
+
+    def resolve_host(self, name):
+        """IPv4 then IPv6 addresses for ``name`` (IP literals pass through)."""
+        if _is_ip(name):
+            return [name]
+        return self.resolve(name, "A") + self.resolve(name, "AAAA")
+
+    def reverse(self, ip):
+        answers = self.resolve(dns.reversename.from_address(ip).to_text(), "PTR")
+        return answers[0].rstrip(".") if answers else None
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+
+def _key(name, rtype):
+    return name.lower().rstrip("."), rtype.upper()
+
+
+def _is_ip(host):
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+_resolver = CachingResolver()
+
+
+def get_resolver():
+    return _resolver
+
+
+def resolve(name, rtype="A"):
+    return _resolver.resolve(name, rtype)
+
+
+async def aresolve(name, rtype="A"):
+    return await _resolver.aresolve(name, rtype)
+
+
+def resolve_host(name):
+    return _resolver.resolve_host(name)
+
+
+def settled(name, rtype="A"):
+    return _resolver.settled(name, rtype)
+
+
+def reverse(ip):
+    return _resolver.reverse(ip)
+
+
+def stats():
+    return _resolver.stats()
+
+
+# ---------------------------
+#  Socket / urllib3 Integration
+# ---------------------------
+_targets = set()
+_system_create_connection = None
+
+
+def add_target(domain):
+    """Resolve ``domain`` and every name under it through the shared cache from now on.
+
+    Installs the urllib3 hook on first use; hosts that are not scan targets
+    keep the system resolver (/etc/hosts, localhost, local APIs).
+    """
+    _targets.add(domain.lower().rstrip("."))
+    install_urllib3_hook()
+
+
+def is_target(host):
+    labels = host.lower().rstrip(".").split(".")
+    return any(".".join(labels[i:]) in _targets for i in range(len(labels)))
+
+
+def _system_connect(address, timeout, source_address, socket_options):
+    if _system_create_connection is None:
+        return socket.create_connection(address, timeout, source_address)
+    return _system_create_connection(address, timeout=timeout, source_address=source_address,
+                                     socket_options=socket_options)
+
+
+def create_connection(address, timeout=None, source_address=None, socket_options=None):
+    """urllib3 create_connection replacement that resolves scan targets through the shared cache."""
+    host, port = address
+    addresses = resolve_host(host) if is_target(host) else []
+    if not addresses:
+        # Other hosts, and targets only the system knows (hosts file), resolve as usual
+        return _system_connect(address, timeout, source_address, socket_options)
+
+    error = None
+    for ip in addresses:
+        family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            for option in socket_options or ():
+                sock.setsockopt(*option)
+            # urllib3 passes its own "default timeout" sentinel; leave the socket blocking then
+            if timeout is None or isinstance(timeout, (int, float)):
+                sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect((ip, port))
+            return sock
+        except OSError as e:
+            error = e
+            sock.close()
+    raise error
+
+
+def install_urllib3_hook():
+    """Route requests/urllib3 connections to scan targets (see add_target) through the shared resolver."""
+    global _system_create_connection
+    import urllib3.util.connection
+    if urllib3.util.connection.create_connection is not create_connection:
+        _system_create_connection = urllib3.util.connection.create_connection
+        urllib3.util.connection.create_connection = create_connection
+
+
+# ---------------------------
+#  aiohttp Integration
+# ---------------------------
+class AiohttpResolver(AbstractResolver):
+    """aiohttp resolver backed by the shared cache (lookups run in the default executor).
+
+    Names the cache cannot resolve fall back to the system resolver.
+    """
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        loop = asyncio.get_running_loop()
+        addresses = await loop.run_in_executor(None, resolve_host, host)
+        if not addresses:
+            # Names only the system resolver knows (hosts file, localhost)
+            infos = await loop.getaddrinfo(host, port, family=family, type=socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        results = []
+        for ip in addresses:
+            ip_family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+            if family not in (socket.AF_UNSPEC, ip_family):
+                continue
+            results.append({
+                "hostname": host,
+                "host": ip,
+                "port": port,
+                "family": ip_family,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST,
+            })
+        if not results:
+            raise OSError(f"Could not resolve {host}")
+        return results
+
+    async def close(self):
+        pass
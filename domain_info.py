@@ -1,51 +1,175 @@
 #!/usr/bin/env python3
-import socket
-import requests
-import subprocess
-import ssl
-import dns.resolver
+import asyncio
+import sys
+import json
+import threading
+import codecs
 import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, wait, FIRST_COMPLETED
+from modules import dns_cache, http_client, results_store, tls_harvest, whois_client
+from modules.result_cache import cached
 
 TOP_N_SUBDOMAINS = 50
+EXTRAS_MAX_BYTES = 4000     # robots.txt / sitemap.xml bytes kept per file
+
+# crt.sh responses are parsed as a stream; see iter_json_array
+CRTSH_CHUNK = 65536
+MAX_JSON_ELEMENT = 1024 * 1024
+MAX_SUBDOMAINS = 100000
+
+DNS_RTYPES = ["A", "AAAA", "CNAME", "MX", "NS", "TXT"]
+DNS_LIFETIME = 5
+
+# Seconds each stage may take before the report is built without it
+STAGE_DEADLINES = {
+    "dns": DNS_LIFETIME + 1,
+    "ptr": 5,
+    "whois": 15,
+    "subdomains": 20,
+    "ssl": 8,
+    "http": 30,
+    "liveness": 600,
+    "certificates": 120,
+}
+
+# Subdomain liveness: names checked at once, TCP connect timeout per port,
+# and the ports probed (set PROBE_LIVENESS = False for DNS-only checks)
+LIVENESS_CONCURRENCY = 200
+LIVENESS_TIMEOUT = 3
+LIVENESS_PORTS = (80, 443)
+PROBE_LIVENESS = True
+
+# Certificates harvested concurrently from the apex and live subdomains
+TLS_CONCURRENCY = 100
+
+# Bulk runs: domains in flight, and process-wide caps toward shared services
+BULK_WORKERS = 8
+CRTSH_CONCURRENCY = 2
+WHOIS_CONCURRENCY = 4
+
+# Pool threads per domain in flight: five stages plus PTR, one per DNS type
+STAGE_THREADS = 6
+DNS_THREADS = len(DNS_RTYPES)
+
+_CRTSH_SLOTS = threading.BoundedSemaphore(CRTSH_CONCURRENCY)
+_WHOIS_SLOTS = threading.BoundedSemaphore(WHOIS_CONCURRENCY)
+
+# ----------------- STAGE POOLS -----------------
+class ReconPools:
+    """Thread pools for ``workers`` domains in flight.
+
+    Stages and DNS lookups use separate pools so a stage waiting on its
+    lookups can never starve them of workers.
+    """
+
+    def __init__(self, workers=1):
+        self.stages = ThreadPoolExecutor(max_workers=workers * STAGE_THREADS,
+                                         thread_name_prefix="recon-stage")
+        self.dns = ThreadPoolExecutor(max_workers=workers * DNS_THREADS,
+                                      thread_name_prefix="recon-dns")
+
+    def shutdown(self):
+        # Abandoned stages finish on their own; don't wait for them
+        self.stages.shutdown(wait=False)
+        self.dns.shutdown(wait=False)
+
+_default_pools = None
+_default_pools_lock = threading.Lock()
+
+def _get_default_pools():
+    global _default_pools
+    with _default_pools_lock:
+        if _default_pools is None:
+            _default_pools = ReconPools()
+        return _default_pools
+
+_running = threading.local()
+
+class _Stage:
+    """A stage submitted to a pool whose deadline counts from when it starts work.
+
+    Time queued for a pool thread doesn't count. ``deferred`` stages also
+    wait for a shared crt.sh / whois slot first and start their own clock
+    with _stage_started() once they hold it.
+    """
+
+    def __init__(self, pool, fn, *args, deferred=False):
+        self.began = None
+        self._started = threading.Event()
+        self.future = pool.submit(self._run, fn, args, deferred)
+        self.future.add_done_callback(lambda _: self._started.set())
+
+    def _run(self, fn, args, deferred):
+        _running.stage = self
+        try:
+            if not deferred:
+                self.start()
+            return fn(*args)
+        finally:
+            _running.stage = None
+
+    def start(self):
+        self.began = time.monotonic()
+        self._started.set()
+
+    def result(self, deadline):
+        """The stage's value, waiting at most ``deadline`` seconds once it has started."""
+        self._started.wait()
+        began = self.began or time.monotonic()
+        return self.future.result(timeout=max(0, began + deadline - time.monotonic()))
+
+def _stage_started():
+    """Start the calling stage's deadline now (no-op outside a stage)."""
+    stage = getattr(_running, "stage", None)
+    if stage is not None:
+        stage.start()
 
 # ----------------- DOMAIN RECON FUNCTIONS -----------------
-def get_whois_info(domain):
+def _is_error(result):
+    return isinstance(result, dict) and "error" in result
+
+def _is_failure(result):
+    # Lookups below return None / {} only when the request itself failed
+    return result is None or result == {}
+
+def _revalidating(state=None):
+    # Re-scans pass their snapshot state and must revalidate, not reuse the cache
+    return state is not None
+
+@cached("domain", "whois", skip=_is_error)
+def get_whois_info(domain, deadline=None):
+    with _WHOIS_SLOTS:
+        _stage_started()
+        return _whois_lookup(domain, deadline or STAGE_DEADLINES["whois"])
+
+def _whois_lookup(domain, deadline):
     try:
-        import whois
-        data = whois.whois(domain)
-        return {
-            "Registrar": data.get("registrar", "N/A"),
-            "Creation Date": str(data.get("creation_date")),
-            "Expiration Date": str(data.get("expiration_date")),
-            "Registrant": data.get("org", "N/A"),
-            "Country": data.get("country", "N/A"),
-            "Name Servers": data.get("name_servers", "N/A"),
-            "Status": data.get("status", "N/A"),
-        }
-    except Exception:
-        try:
-            raw = subprocess.check_output(["whois", domain], text=True, timeout=10)
-            lines = raw.splitlines()
-            filtered = [line for line in lines if line.strip()][:20]
-            return {"raw": "\n".join(filtered)}
-        except Exception as e:
-            return {"error": str(e)}
+        return whois_client.lookup(domain, timeout=max(1, deadline - 5))
+    except Exception as e:
+        return {"error": str(e)}
 
-def get_dns_records(domain):
+def _resolve_rtype(domain, rtype):
+    return dns_cache.resolve(domain, rtype)
+
+# Not result-cached: dns_cache already keeps each answer for its own TTL
+def get_dns_records(domain, pool=None, deadline=None):
+    pool = pool or _get_default_pools().dns
+    futures = {rtype: pool.submit(_resolve_rtype, domain, rtype) for rtype in DNS_RTYPES}
+    stop_at = time.monotonic() + (deadline or STAGE_DEADLINES["dns"])
     records = {}
-    rtypes = ["A", "AAAA", "CNAME", "MX", "NS", "TXT"]
-    for rtype in rtypes:
+    for rtype, future in futures.items():
         try:
-            answers = dns.resolver.resolve(domain, rtype, lifetime=5)
-            records[rtype] = [str(a.to_text()) for a in answers]
-        except Exception:
+            records[rtype] = future.result(timeout=max(0, stop_at - time.monotonic()))
+        except FutureTimeout:
             records[rtype] = []
     return records
 
+# No PTR record also gives None; the DNS cache already keeps that answer for its TTL
+@cached("domain", "ptr", skip=_is_failure)
 def reverse_dns(ip):
     try:
-        name, _, _ = socket.gethostbyaddr(ip)
-        return name
+        return dns_cache.reverse(ip)
     except Exception:
         return None
 
@@ -60,46 +184,227 @@ def parse_spf_dmarc(txt_records):
             dmarc.append(t)
     return {"SPF": spf, "DMARC": dmarc}
 
-def get_subdomains(domain):
+@cached("domain", "crtsh", skip=_is_failure, refresh=_revalidating)
+def get_subdomains(domain, state=None):
+    """Subdomains from certificate transparency (crt.sh), or None if crt.sh failed.
+
+    ``state`` (optional) carries the previous run's validators, highest
+    certificate id and names under "crtsh"; it is updated in place so a
+    re-scan can skip unchanged data.
+    """
+    with _CRTSH_SLOTS:
+        _stage_started()
+        return _crtsh_lookup(domain, state)
+
+def _crtsh_lookup(domain, state=None):
+    previous = (state or {}).get("crtsh", {})
     try:
         url = f"https://crt.sh/?q=%25.{domain}&output=json"
-        resp = requests.get(url, timeout=10)
-        data = resp.json()
-        subs = set()
-        for entry in data:
-            name = entry.get('name_value', '')
-            for n in name.split('\n'):
-                n = n.strip()
-                if n and domain in n:
-                    subs.add(n)
-        return sorted(subs)
+        headers = http_client.conditional_headers(previous)
+        with http_client.get_session().get(url, timeout=10, stream=True, headers=headers) as resp:
+            if resp.status_code == 304 and "names" in previous:
+                if state is not None:
+                    state["crtsh"] = http_client.revalidated(previous, resp)
+                return previous["names"]
+            entries = iter_json_array(resp.iter_content(CRTSH_CHUNK))
+            names, max_id = collect_subdomains(domain, entries, previous.get("names", ()),
+                                               previous.get("max_id", 0))
+            if state is not None:
+                state["crtsh"] = {**http_client.validators_of(resp), "max_id": max_id, "names": names}
+            return names
+    except Exception:
+        return None
+
+def iter_json_array(chunks):
+    """Yield the elements of a top-level JSON array read from byte chunks.
+
+    Only the unparsed tail of the stream is buffered, so memory is bounded
+    by the largest single element rather than the whole document.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buf = ""
+    pos = 0
+    opened = False
+    for chunk in chunks:
+        buf = buf[pos:] + text.decode(chunk)
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                break
+            if not opened:
+                if buf[pos] != "[":
+                    raise ValueError("expected a JSON array")
+                opened = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Element continues in the next chunk
+                if len(buf) - pos > MAX_JSON_ELEMENT:
+                    raise ValueError("JSON element exceeds size limit")
+                break
+            yield item
+
+def collect_subdomains(domain, entries, known=(), since_id=0):
+    """Distinct names under ``domain`` from crt.sh entries, matched by label suffix.
+
+    Wildcards collapse onto their base name. Only the part in front of the
+    domain is kept while collecting, which keeps the set small. Entries with
+    an id at or below ``since_id`` were seen in an earlier run and only
+    their id is looked at; their names come from ``known``.
+
+    Returns (sorted names, highest certificate id seen).
+    """
+    domain = domain.lower().rstrip(".")
+    suffix = "." + domain
+    prefixes = set()
+    max_id = since_id
+    for name in known:
+        prefixes.add("" if name == domain else name[:-len(suffix)])
+    for entry in entries:
+        cert_id = entry.get("id") or 0
+        if cert_id and cert_id <= since_id:
+            continue
+        max_id = max(max_id, cert_id)
+        for n in entry.get('name_value', '').split('\n'):
+            n = n.strip().lower().rstrip(".")
+            if n.startswith("*."):
+                n = n[2:]
+            if n == domain:
+                prefixes.add("")
+            elif n.endswith(suffix):
+                prefixes.add(n[:-len(suffix)])
+        if len(prefixes) >= MAX_SUBDOMAINS:
+            break
+    return sorted(p + suffix if p else domain for p in prefixes), max_id
+
+# ----------------- SUBDOMAIN LIVENESS -----------------
+async def _port_open(ip, port, timeout):
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+    except Exception:
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
     except Exception:
-        return []
+        pass
+    return True
+
+async def check_subdomain(name, ports=LIVENESS_PORTS, timeout=LIVENESS_TIMEOUT):
+    a, aaaa, cname = await asyncio.gather(
+        dns_cache.aresolve(name, "A"),
+        dns_cache.aresolve(name, "AAAA"),
+        dns_cache.aresolve(name, "CNAME"),
+    )
+    addresses = a + aaaa
+    result = {"name": name, "a": a, "aaaa": aaaa, "cname": cname,
+              "resolves": bool(addresses), "open_ports": [], "live": bool(addresses)}
+    if addresses and ports:
+        checks = await asyncio.gather(*(_port_open(addresses[0], port, timeout) for port in ports))
+        result["open_ports"] = [port for port, ok in zip(ports, checks) if ok]
+        result["live"] = bool(result["open_ports"])
+    return result
+
+async def iter_subdomain_liveness(names, concurrency=LIVENESS_CONCURRENCY,
+                                  ports=LIVENESS_PORTS, timeout=LIVENESS_TIMEOUT):
+    """Resolve (and optionally port-probe) names, yielding each result as it completes."""
+    names = iter(names)
+    out = asyncio.Queue(maxsize=concurrency)
+    name_deadline = DNS_LIFETIME + timeout
+
+    async def worker():
+        # Workers share one iterator, so only `concurrency` names are ever in flight
+        for name in names:
+            try:
+                result = await asyncio.wait_for(check_subdomain(name, ports, timeout), name_deadline)
+            except asyncio.TimeoutError:
+                result = {"name": name, "a": [], "aaaa": [], "cname": [], "resolves": False,
+                          "open_ports": [], "live": False, "error": "timeout"}
+            await out.put(result)
+
+    async def run():
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        await out.put(None)
 
+    runner = asyncio.create_task(run())
+    try:
+        while True:
+            result = await out.get()
+            if result is None:
+                break
+            yield result
+    finally:
+        runner.cancel()
+
+def resolve_subdomains(names, on_result=None, deadline=None, **kwargs):
+    """Run the liveness stage from synchronous code, stopping early at ``deadline`` seconds."""
+    async def run():
+        results = []
+        stop_at = time.monotonic() + deadline if deadline else None
+        stream = iter_subdomain_liveness(names, **kwargs)
+        try:
+            async for result in stream:
+                results.append(result)
+                if on_result:
+                    on_result(result)
+                if stop_at and time.monotonic() > stop_at:
+                    break
+        finally:
+            await stream.aclose()
+        return results
+    return asyncio.run(run())
+
+def format_liveness(result):
+    if result["live"]:
+        ports = f" {result['open_ports']}" if result["open_ports"] else ""
+        return f"✔ {result['name']} → {', '.join(result['a'] + result['aaaa'])}{ports}"
+    cname = f" (CNAME {', '.join(result['cname'])})" if result["cname"] else ""
+    return f"❌ {result['name']}{cname}"
+
+@cached("domain", "ssl", skip=_is_failure)
 def get_ssl_info(domain):
     try:
-        context = ssl.create_default_context()
-        with context.wrap_socket(socket.socket(), server_hostname=domain) as s:
-            s.settimeout(5)
-            s.connect((domain, 443))
-            cert = s.getpeercert()
-            issuer = dict(x[0] for x in cert.get('issuer', [])) if cert.get('issuer') else None
-            subject = dict(x[0] for x in cert.get('subject', [])) if cert.get('subject') else None
-            return {
-                "issuer": issuer or cert.get('issuer'),
-                "subject": subject or cert.get('subject'),
-                "valid_from": cert.get('notBefore'),
-                "valid_to": cert.get('notAfter')
-            }
+        cert = tls_harvest.get_certificate(domain, timeout=5)
     except Exception:
         return {}
+    return {
+        "issuer": cert["issuer"],
+        "subject": cert["subject"],
+        "valid_from": cert["not_before"],
+        "valid_to": cert["not_after"],
+        "sans": cert["sans"],
+        "key_type": cert["key_type"],
+        "fingerprint_sha256": cert["fingerprint_sha256"],
+        "verified": cert["verified"],
+        "chain_length": len(cert["chain"]) + 1,
+    }
+
+def format_certificates(harvest):
+    certs = harvest["certificates"]
+    lines = [f"Unique certificates: {len(certs)} across {len(harvest['hosts'])} hosts "
+             f"({len(harvest['errors'])} failed)"]
+    for fingerprint, cert in certs.items():
+        flag = "" if cert["verified"] else " ⚠ unverified"
+        lines.append(f"{fingerprint[:16]} | {cert['subject']} | issuer {cert['issuer']} | "
+                     f"expires {cert['not_after']} | {cert['key_type']} | "
+                     f"{len(cert['hosts'])} hosts{flag}")
+    return "\n".join(lines)
 
+@cached("domain", "headers", skip=_is_failure)
 def check_security_headers(domain):
     try:
-        resp = requests.head(f"https://{domain}", timeout=6, allow_redirects=True)
+        resp = http_client.head(f"https://{domain}")
     except Exception:
         try:
-            resp = requests.get(f"http://{domain}", timeout=6, allow_redirects=True)
+            # Only the headers are needed, so don't download the page
+            resp, _ = http_client.fetch_capped(f"http://{domain}", 0)
         except Exception:
             return {}
     headers = resp.headers
@@ -113,51 +418,243 @@ def check_security_headers(domain):
     }
     return security
 
-def fetch_robots_sitemap(domain):
+@cached("domain", "robots", skip=_is_failure, refresh=_revalidating)
+def fetch_robots_sitemap(domain, state=None):
+    """robots.txt and sitemap.xml (capped), revalidated against ``state["robots"]`` if given.
+
+    HTTPS falls back to HTTP. Returns {} if every request for both files
+    raised (a 404 still counts as an answer), so the failure isn't cached.
+    """
+    previous = (state or {}).get("robots", {})
+    validators = {}
     out = {}
+    failed = 0
     for path in ["/robots.txt", "/sitemap.xml"]:
+        known = previous.get(path) or {}
+        headers = http_client.conditional_headers(known)
         try:
-            url = f"https://{domain}{path}"
-            r = requests.get(url, timeout=6)
-            if r.status_code == 200:
-                out[path] = r.text[:4000]
+            try:
+                r, text = http_client.fetch_capped(f"https://{domain}{path}", EXTRAS_MAX_BYTES,
+                                                   headers=headers)
+            except Exception:
+                r = None
+            if r is None or r.status_code not in (200, 304):
+                r, text = http_client.fetch_capped(f"http://{domain}{path}", EXTRAS_MAX_BYTES,
+                                                   headers=headers)
+            if r.status_code == 304:
+                out[path] = known.get("body")
+                validators[path] = http_client.revalidated(known, r)
             else:
-                url = f"http://{domain}{path}"
-                r = requests.get(url, timeout=6)
-                out[path] = r.text[:4000] if r.status_code == 200 else None
+                out[path] = text if r.status_code == 200 else None
+                validators[path] = {**http_client.validators_of(r), "body": out[path]}
         except Exception:
             out[path] = None
-    return out
+            failed += 1
+            # Keep what the last run stored so the next one can still revalidate
+            if known:
+                validators[path] = known
+    if state is not None:
+        state["robots"] = validators
+    return {} if failed == len(out) else out
 
 # ----------------- DOMAIN RECON WRAPPER -----------------
-def domain_recon(domain):
-    print(f"\n🌐 Recon for domain: {domain}\n")
-    report = { "dns": "", "whois": "", "spf_dmarc": "", "subdomains": "", "ssl": "", "headers": "", "extras": "" }
+def _http_stage(domain, state=None):
+    # Sequential on purpose: headers, robots.txt and sitemap.xml then share
+    # one pooled keep-alive connection to the host
+    return check_security_headers(domain), fetch_robots_sitemap(domain, state)
 
-    dns_records = get_dns_records(domain)
-    report["dns"] = f"A: {dns_records.get('A')}\nAAAA: {dns_records.get('AAAA')}\nAll: {dns_records}"
-    if dns_records.get("A"):
-        rdns = reverse_dns(dns_records["A"][0])
-        print(f"PTR: {rdns}")
+def stage_deadlines(timeout=None):
+    """STAGE_DEADLINES with every stage capped at ``timeout`` seconds, if given."""
+    if not timeout:
+        return dict(STAGE_DEADLINES)
+    return {stage: min(deadline, timeout) for stage, deadline in STAGE_DEADLINES.items()}
 
-    whois_data = get_whois_info(domain)
-    report["whois"] = "\n".join([f"{k}: {v}" for k, v in whois_data.items()])
+def _stage_result(name, stage, deadlines):
+    """Wait for a stage until its deadline; returns (value, problem).
 
-    txts = dns_records.get("TXT", [])
-    spf_dmarc = parse_spf_dmarc(txts)
-    report["spf_dmarc"] = f"SPF: {spf_dmarc.get('SPF')}\nDMARC: {spf_dmarc.get('DMARC')}"
+    A timed-out stage is only abandoned: a running stage keeps its pool
+    thread until its own request timeouts (whois, crt.sh, TLS and HTTP all
+    set one) end it.
+    """
+    try:
+        return stage.result(deadlines[name]), None
+    except FutureTimeout:
+        return None, f"⏱ Timed out after {deadlines[name]}s"
+    except Exception as e:
+        return None, f"⚠ Failed: {e}"
 
-    subs = get_subdomains(domain)
-    report["subdomains"] = "\n".join(subs[:TOP_N_SUBDOMAINS]) if subs else "None"
+def domain_recon(domain, quiet=False, state=None, pools=None, timeout=None):
+    """Run every recon stage for ``domain`` and return the text report.
 
-    ssl_info = get_ssl_info(domain)
-    report["ssl"] = "\n".join([f"{k}: {v}" for k, v in ssl_info.items()]) if ssl_info else "Could NOT fetch"
+    ``state`` is optional per-target memory for re-scans (conditional
+    request validators, crt.sh watermark); stages update it in place.
+    ``pools`` (a ReconPools) is shared by the domains of a bulk run, and
+    ``timeout`` caps every stage deadline for this call.
+    """
+    if not quiet:
+        print(f"\n🌐 Recon for domain: {domain}\n")
+    # The domain's own hosts (headers, robots) resolve through the shared cache
+    dns_cache.add_target(domain)
+    report = { "dns": "", "whois": "", "spf_dmarc": "", "subdomains": "", "live_subdomains": "", "ssl": "", "certificates": "", "headers": "", "extras": "" }
 
-    sec = check_security_headers(domain)
-    report["headers"] = "\n".join([f"{k}: {v}" for k, v in sec.items()])
+    # Independent stages all start now; each is collected against its own deadline
+    pools = pools or _get_default_pools()
+    deadlines = stage_deadlines(timeout)
+    stages = {
+        "dns": _Stage(pools.stages, get_dns_records, domain, pools.dns, deadlines["dns"]),
+        "whois": _Stage(pools.stages, get_whois_info, domain, deadlines["whois"], deferred=True),
+        "subdomains": _Stage(pools.stages, get_subdomains, domain, state, deferred=True),
+        "ssl": _Stage(pools.stages, get_ssl_info, domain),
+        "http": _Stage(pools.stages, _http_stage, domain, state),
+    }
 
-    extras = fetch_robots_sitemap(domain)
-    report["extras"] = f"robots.txt: {bool(extras.get('/robots.txt'))}\nsitemap.xml: {bool(extras.get('/sitemap.xml'))}"
+    dns_records, problem = _stage_result("dns", stages["dns"], deadlines)
+    if problem:
+        report["dns"] = report["spf_dmarc"] = problem
+    else:
+        report["dns"] = f"A: {dns_records.get('A')}\nAAAA: {dns_records.get('AAAA')}\nAll: {dns_records}"
+        if dns_records.get("A"):
+            ptr = _Stage(pools.stages, reverse_dns, dns_records["A"][0])
+            rdns, _ = _stage_result("ptr", ptr, deadlines)
+            if not quiet:
+                print(f"PTR: {rdns}")
+
+        txts = dns_records.get("TXT", [])
+        spf_dmarc = parse_spf_dmarc(txts)
+        report["spf_dmarc"] = f"SPF: {spf_dmarc.get('SPF')}\nDMARC: {spf_dmarc.get('DMARC')}"
+
+    whois_data, problem = _stage_result("whois", stages["whois"], deadlines)
+    report["whois"] = problem or "\n".join([f"{k}: {v}" for k, v in whois_data.items()])
+
+    subs, problem = _stage_result("subdomains", stages["subdomains"], deadlines)
+    if subs is None and not problem:
+        problem = "Could NOT fetch"
+    report["subdomains"] = problem or ("\n".join(subs[:TOP_N_SUBDOMAINS]) if subs else "None")
+
+    if subs:
+        lines = []
+
+        def record(result):
+            line = format_liveness(result)
+            lines.append(line)
+            if not quiet:
+                print(line)
+
+        ports = LIVENESS_PORTS if PROBE_LIVENESS else ()
+        checked = resolve_subdomains(subs, on_result=record,
+                                     deadline=deadlines["liveness"], ports=ports)
+        live = sum(1 for r in checked if r["live"])
+        summary = f"Live: {live} / Checked: {len(checked)} / Discovered: {len(subs)}"
+        report["live_subdomains"] = "\n".join([summary] + lines)
+
+        # TLS hosts: the apex plus subdomains serving 443 (or resolving, if ports aren't probed)
+        hosts = [domain] + [
+            r["name"] for r in checked
+            if r["name"] != domain and (443 in r["open_ports"] if ports else r["resolves"])
+        ]
+        try:
+            harvest = tls_harvest.harvest(hosts, concurrency=TLS_CONCURRENCY,
+                                          deadline=deadlines["certificates"])
+            report["certificates"] = format_certificates(harvest)
+        except Exception as e:
+            report["certificates"] = f"⚠ Failed: {e}"
+    else:
+        report["live_subdomains"] = "None"
+        report["certificates"] = "None"
+
+    ssl_info, problem = _stage_result("ssl", stages["ssl"], deadlines)
+    report["ssl"] = problem or ("\n".join([f"{k}: {v}" for k, v in ssl_info.items()]) if ssl_info else "Could NOT fetch")
+
+    http, problem = _stage_result("http", stages["http"], deadlines)
+    if problem:
+        report["headers"] = report["extras"] = problem
+    else:
+        sec, extras = http
+        report["headers"] = "\n".join([f"{k}: {v}" for k, v in sec.items()])
+        report["extras"] = f"robots.txt: {bool(extras.get('/robots.txt'))}\nsitemap.xml: {bool(extras.get('/sitemap.xml'))}"
 
     return report
 
+# ----------------- BULK DOMAIN RECON -----------------
+def load_domains(source):
+    """Yield unique, normalised domains from a file path ('-' for stdin) or an iterable."""
+    if isinstance(source, str):
+        handle = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+        try:
+            yield from _unique_domains(handle)
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+    else:
+        yield from _unique_domains(source)
+
+def _unique_domains(lines):
+    seen = set()
+    for line in lines:
+        domain = line.strip().lower().rstrip(".")
+        if domain and not domain.startswith("#") and domain not in seen:
+            seen.add(domain)
+            yield domain
+
+def domain_recon_bulk(domains, output_path, workers=BULK_WORKERS, on_result=None, timeout=None):
+    """Recon many domains through a bounded worker pool, appending JSONL as each finishes.
+
+    At most ``workers * 2`` domains are queued at once, and each report is
+    written and dropped as soon as it completes, so memory stays flat. The
+    stage and DNS pools are sized for ``workers`` domains in flight, and
+    ``timeout`` caps every stage deadline (see domain_recon).
+    ``on_result`` also receives each {"domain", "report"} record (e.g. an
+    exporters.Exporter's write); with ``output_path`` None it is the only output.
+    """
+    if output_path is None:
+        out = None
+    else:
+        out = sys.stdout if output_path == "-" else open(output_path, "a", encoding="utf-8")
+    done_count = 0
+    failed = 0
+    started = time.monotonic()
+    pools = ReconPools(workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="recon-bulk") as pool, \
+                results_store.get_store().writer("domain") as save:
+            in_flight = {}
+            source = iter(load_domains(domains))
+            exhausted = False
+            while in_flight or not exhausted:
+                while not exhausted and len(in_flight) < workers * 2:
+                    domain = next(source, None)
+                    if domain is None:
+                        exhausted = True
+                    else:
+                        in_flight[pool.submit(domain_recon, domain, True, None, pools, timeout)] = domain
+
+                if not in_flight:
+                    break
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    domain = in_flight.pop(future)
+                    try:
+                        record = {"domain": domain, "report": future.result()}
+                        save(domain, record["report"])
+                    except Exception as e:
+                        failed += 1
+                        record = {"domain": domain, "error": str(e)}
+                    if out:
+                        out.write(json.dumps(record) + "\n")
+                        out.flush()
+                    if on_result:
+                        on_result(record)
+                    done_count += 1
+
+                if out is not sys.stdout:
+                    elapsed = time.monotonic() - started
+                    print(f"\r🌐 {done_count} domains done ({failed} failed), "
+                          f"{done_count / elapsed:.2f}/s", end="", flush=True)
+    finally:
+        pools.shutdown()
+        if out is not sys.stdout:
+            if out:
+                out.close()
+            print()
+
+    return {"domains": done_count, "failed": failed, "elapsed": time.monotonic() - started}
@@ -1,97 +1,369 @@
 import re
-import requests
+import sys
+import time
+import aiohttp
+import asyncio
 import json
-import os
 from datetime import datetime
 from colorama import Fore, Style
+from modules import breach_index, dns_cache, result_cache, results_store
+from modules.rate_limit import RateLimitScheduler, parse_retry_after
 
 USER_AGENT = "CyberEye-EmailCheck/1.0"
 LEAKCHECK_API = "https://leakcheck.io/api/public"
+LEAKCHECK_PROVIDER = "LeakCheck.io"
+LEAKCHECK_TIMEOUT = 10
+
+# Provider fan-out
+PROVIDER_DEADLINE = 6       # seconds a request may take, once sent, before the provider is skipped
+HEDGE_AFTER = 2.0           # send a duplicate request if the first is this slow
+PROVIDER_BUDGET = 15        # seconds a provider may take in all, retries included, once its first token is granted
+
+# Extra APIs answering in LeakCheck's JSON shape, as HttpProvider keyword
+# arguments, e.g. {"name": "Mirror", "url": "http://127.0.0.1:8080/check"}
+BREACH_APIS = []
+
+# Bulk checking
+LEAKCHECK_RATE = 1.0        # public API requests per second
+BULK_CONCURRENCY = 8        # lookups in flight; the rate limit is the real cap
+THROTTLE_STATUSES = {429, 503}
+PROGRESS_INTERVAL = 2.0     # seconds between progress lines
+MX_CONCURRENCY = 50         # domains resolved at once by the validation stage
+BULK_OUTPUT_FILE = "email_results.jsonl"
 
-# File to store the last result
-LAST_RESULT_FILE = "last_result.json"
 REPORT_FILE = "report.html"
 
 
 # ---------------------------
 #  Email Validation
 # ---------------------------
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[a-zA-Z0-9]+$")
+
+
 def is_valid_email(email: str) -> bool:
     """Check if email is valid format"""
-    return re.match(r"^[^@\s]+@[^@\s]+\.[a-zA-Z0-9]+$", email) is not None
+    return EMAIL_PATTERN.match(email) is not None
+
+
+async def mail_domain_status(domain):
+    """"deliverable", "undeliverable" or "unknown" (DNS failed) for an email domain."""
+    mx = await dns_cache.aresolve(domain, "MX")
+    if mx:
+        # A null MX ("0 .", RFC 7505) means the domain accepts no mail
+        hosts = [record.split()[-1].rstrip(".") for record in mx]
+        return "deliverable" if any(hosts) else "undeliverable"
+    if not dns_cache.settled(domain, "MX"):
+        return "unknown"
+
+    # Without MX records mail goes to the domain's own address (RFC 5321)
+    if await dns_cache.aresolve(domain, "A") or await dns_cache.aresolve(domain, "AAAA"):
+        return "deliverable"
+    if dns_cache.settled(domain, "A") and dns_cache.settled(domain, "AAAA"):
+        return "undeliverable"
+    return "unknown"
+
+
+async def validate_emails_async(emails, concurrency=MX_CONCURRENCY):
+    """Split addresses into (kept, undeliverable), resolving each unique domain once.
+
+    Domains whose DNS lookups fail are kept, so only a definite answer
+    drops an address.
+    """
+    by_domain = {}
+    for email in emails:
+        by_domain.setdefault(email.rpartition("@")[2], []).append(email)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def check(domain):
+        async with semaphore:
+            return domain, await mail_domain_status(domain)
+
+    statuses = dict(await asyncio.gather(*(check(domain) for domain in by_domain)))
+    kept = [email for email in emails if statuses[email.rpartition("@")[2]] != "undeliverable"]
+    undeliverable = [email for email in emails if statuses[email.rpartition("@")[2]] == "undeliverable"]
+    return kept, undeliverable
 
 
 # ---------------------------
 #  LeakCheck Lookup
 # ---------------------------
-def leakcheck_lookup(query: str):
-    """Query LeakCheck.io public API"""
+def _leakcheck_result(query, status, data=None, provider=LEAKCHECK_PROVIDER):
+    data = data or {}
+    return {
+        "email": query,
+        "checked_at": datetime.utcnow().isoformat(),
+        "provider": provider,
+        "status": status,
+        "found": data.get("found", 0),
+        "fields": data.get("fields", []),
+        "sources": data.get("sources", [])
+    }
+
+
+def _parse_leakcheck(query, data, provider=LEAKCHECK_PROVIDER):
+    if not data.get("success"):
+        return _leakcheck_result(query, "not_found", provider=provider)
+    status = "found" if data.get("found", 0) > 0 else "not_found"
+    return _leakcheck_result(query, status, data, provider)
+
+
+async def _leakcheck_attempt(session, query, url, param, timeout):
+    """One request: ("ok", data, None), ("throttled", None, retry_after) or ("failed", None, None)."""
     try:
-        response = requests.get(
-            LEAKCHECK_API,
-            params={"check": query},
-            headers={"User-Agent": USER_AGENT},
-            timeout=10
-        )
-        data = response.json()
-
-        if not data.get("success"):
-            return {
-                "email": query,
-                "checked_at": datetime.utcnow().isoformat(),
-                "provider": "LeakCheck.io",
-                "status": "not_found",
-                "found": 0,
-                "fields": [],
-                "sources": []
-            }
-
-        return {
-            "email": query,
-            "checked_at": datetime.utcnow().isoformat(),
-            "provider": "LeakCheck.io",
-            "status": "found" if data.get("found", 0) > 0 else "not_found",
-            "found": data.get("found", 0),
-            "fields": data.get("fields", []),
-            "sources": data.get("sources", [])
-        }
+        async with session.get(url, params={param: query},
+                               timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.status in THROTTLE_STATUSES:
+                return "throttled", None, parse_retry_after(response.headers.get("Retry-After"))
+            if response.status < 500:
+                data = await response.json(content_type=None)
+                # The public API reports its rate limit as an unsuccessful answer
+                if not data.get("success") and "limit" in str(data.get("error", "")).lower():
+                    return "throttled", None, None
+                return "ok", data, None
+    except (asyncio.TimeoutError, aiohttp.ClientError, ValueError):
+        pass
+    return "failed", None, None
+
+
+async def leakcheck_lookup_async(session, query, scheduler, provider=LEAKCHECK_PROVIDER,
+                                 url=LEAKCHECK_API, param="check", timeout=LEAKCHECK_TIMEOUT,
+                                 deadline=None, hedge_after=None, budget=None):
+    """LeakCheck.io lookup paced by ``scheduler``; throttled and failed requests back off and retry.
+
+    Any API answering in LeakCheck's JSON shape can be queried by passing its
+    ``provider`` name, ``url`` and query ``param``. ``deadline`` bounds each
+    attempt from when its rate-limit token is granted, so waiting for a
+    token or backing off never counts; an attempt over it answers "timeout".
+    ``budget`` bounds the whole lookup, backoff and retries included, from
+    when the first token is granted, so a provider that keeps asking us to
+    come back later answers "timeout" instead of holding up the check.
+    """
+    cache = result_cache.get_cache()
+    result = cache.get("email", provider, query)
+    if result is not result_cache.MISS:
+        return result
 
-    except Exception as e:
-        print(f"{Fore.RED}❌ LeakCheck request failed: {e}{Style.RESET_ALL}")
-        return {
-            "email": query,
-            "checked_at": datetime.utcnow().isoformat(),
-            "provider": "LeakCheck.io",
-            "status": "error",
-            "found": 0,
-            "fields": [],
-            "sources": []
-        }
+    await scheduler.acquire(provider)
+    try:
+        return await asyncio.wait_for(
+            _leakcheck_attempts(session, query, scheduler, provider, url, param, timeout,
+                                deadline, hedge_after), budget)
+    except asyncio.TimeoutError:
+        return _leakcheck_result(query, "timeout", provider=provider)
+
+
+async def _leakcheck_attempts(session, query, scheduler, provider, url, param, timeout,
+                              deadline, hedge_after):
+    """The attempt loop of leakcheck_lookup_async; the first token is already granted."""
+    cache = result_cache.get_cache()
+
+    def request():
+        return _leakcheck_attempt(session, query, url, param, timeout)
+
+    attempt = 0
+    while True:
+        if attempt:
+            await scheduler.acquire(provider, attempt)
+        try:
+            outcome, data, retry_after = await asyncio.wait_for(
+                _hedged(request, hedge_after, lambda: scheduler.try_acquire(provider)), deadline)
+        except asyncio.TimeoutError:
+            return _leakcheck_result(query, "timeout", provider=provider)
+
+        if outcome == "ok":
+            scheduler.succeeded(provider)
+            result = _parse_leakcheck(query, data, provider)
+            cache.set("email", provider, query, result, negative=result["status"] == "not_found")
+            return result
+        if not scheduler.can_retry(attempt):
+            return _leakcheck_result(query, "error", provider=provider)
+        await scheduler.retry_wait(provider, attempt, retry_after, outcome == "throttled")
+        attempt += 1
 
 
 # ---------------------------
-#  Save Last Result
+#  Breach Providers
 # ---------------------------
-def save_last_result(result):
-    """Save only the last checked email result"""
+class HttpProvider:
+    """A breach API answering in LeakCheck's JSON shape.
+
+    ``deadline`` bounds each request once it is sent; if no answer has
+    arrived after ``hedge_after`` seconds and the provider's rate limit has a
+    token to spare, a second, identical request races the first and
+    whichever answers first wins. ``budget`` bounds the whole lookup,
+    Retry-After waits included; None waits as long as the provider asks.
+    """
+
+    def __init__(self, name, url, param="check", rate=None, deadline=PROVIDER_DEADLINE,
+                 hedge_after=HEDGE_AFTER, timeout=LEAKCHECK_TIMEOUT, budget=PROVIDER_BUDGET):
+        self.name = name
+        self.url = url
+        self.param = param
+        self.rate = rate
+        self.deadline = deadline
+        self.hedge_after = hedge_after
+        self.timeout = timeout
+        self.budget = budget
+
+    async def lookup(self, session, email, scheduler):
+        return await leakcheck_lookup_async(session, email, scheduler, self.name, self.url,
+                                            self.param, self.timeout, self.deadline, self.hedge_after,
+                                            self.budget)
+
+
+class OfflineProvider:
+    """The local breach_index corpus; answers without touching the network."""
+
+    rate = None
+
+    def __init__(self, index_dir=breach_index.INDEX_DIR):
+        self.index = breach_index.get_index(index_dir)
+        self.name = breach_index.PROVIDER
+
+    async def lookup(self, session, email, scheduler):
+        return self.index.lookup(email)
+
+
+def default_providers(timeout=None, budget=PROVIDER_BUDGET):
+    """LeakCheck, the offline corpus if one has been built, and any BREACH_APIS.
+
+    ``timeout`` overrides both the request timeout and the deadline of the
+    HTTP providers; ``budget`` caps each one's whole lookup. Bulk runs pass
+    budget=None so a throttling provider is waited out rather than skipped.
+    """
+    limits = {"timeout": timeout, "deadline": timeout} if timeout else {}
+    limits["budget"] = budget
+    providers = [HttpProvider(LEAKCHECK_PROVIDER, LEAKCHECK_API, rate=LEAKCHECK_RATE, **limits)]
+    offline = OfflineProvider()
+    if offline.index.available():
+        providers.append(offline)
+    providers += [HttpProvider(**{**api, **limits}) for api in BREACH_APIS]
+    return providers
+
+
+def create_scheduler(providers):
+    return RateLimitScheduler(rates={p.name: p.rate for p in providers if p.rate})
+
+
+async def _hedged(request, hedge_after=None, can_hedge=None):
+    """Run ``request()``; if it is still pending after ``hedge_after`` s and
+    ``can_hedge()`` allows it, race a second copy. The first "ok" outcome wins."""
+    tasks = [asyncio.ensure_future(request())]
+    try:
+        if hedge_after is not None:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done and (can_hedge is None or can_hedge()):
+                tasks.append(asyncio.ensure_future(request()))
+
+        outcome = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if result[0] == "ok":
+                    return result
+                outcome = outcome or result
+        return outcome
+    finally:
+        # Also runs when the attempt deadline cancels us mid-race
+        for task in tasks:
+            task.cancel()
+
+
+def merge_sources(results):
+    """Sources from every answer, de-duplicated by name and date.
+
+    An undated entry is dropped when another provider dates the same breach.
+    """
+    merged = {}
+    for result in results:
+        for source in result.get("sources", []):
+            name = (source.get("name") or "").strip()
+            if not name:
+                continue
+            dates = merged.setdefault(name.lower(), {"name": name, "dates": []})["dates"]
+            date = source.get("date") or None
+            if date not in dates:
+                dates.append(date)
+
+    sources = []
+    for entry in merged.values():
+        dated = [d for d in entry["dates"] if d]
+        for date in dated or [None]:
+            sources.append({"name": entry["name"], "date": date})
+    return sources
+
+
+async def _ask(provider, session, email, scheduler):
+    try:
+        return await provider.lookup(session, email, scheduler)
+    except Exception:
+        return _leakcheck_result(email, "error", provider=provider.name)
+
+
+async def lookup_all_async(email, providers=None, session=None, scheduler=None):
+    """Ask every provider at once and merge their answers into one leakcheck-shaped dict.
+
+    The merged dict adds "providers": {name: status}, so a slow or failed
+    source shows up as "timeout" or "error" instead of failing the check.
+    """
+    providers = providers or default_providers()
+    scheduler = scheduler or create_scheduler(providers)
+    if session is None:
+        async with create_session() as session:
+            return await lookup_all_async(email, providers, session, scheduler)
+
+    results = await asyncio.gather(*(_ask(p, session, email, scheduler) for p in providers))
+    answered = [r for r in results if r["status"] in ("found", "not_found")]
+    breached = [r for r in answered if r["status"] == "found"]
+    sources = merge_sources(breached)
+
+    if sources:
+        status = "found"
+    elif answered:
+        status = "not_found"
+    else:
+        status = "error"
+    return {
+        "email": email,
+        "checked_at": datetime.utcnow().isoformat(),
+        "provider": ", ".join(r["provider"] for r in answered) or "none",
+        "status": status,
+        "found": len(sources),
+        "fields": sorted({field for r in breached for field in r.get("fields", [])}),
+        "sources": sources,
+        "providers": {r["provider"]: r["status"] for r in results}
+    }
+
+
+def lookup_all(email, providers=None):
+    return asyncio.run(lookup_all_async(email, providers))
+
+
+# ---------------------------
+#  Save Result
+# ---------------------------
+def save_result(result):
+    """Append the checked email's result to the results store"""
     try:
-        with open(LAST_RESULT_FILE, "w") as f:
-            json.dump(result, f, indent=4)
+        results_store.record("email", result["email"], result)
     except Exception as e:
-        print(f"{Fore.RED}❌ Failed to save last result: {e}{Style.RESET_ALL}")
+        print(f"{Fore.RED}❌ Failed to save result: {e}{Style.RESET_ALL}")
 
 
 # ---------------------------
 #  Generate HTML Report
 # ---------------------------
-def generate_report():
-    """Generate human-readable report from last_result.json"""
-    if not os.path.exists(LAST_RESULT_FILE):
+def generate_report(email=None):
+    """Generate human-readable report from the latest stored result (for ``email`` if given)"""
+    scan = results_store.latest("email", email)
+    if scan is None:
         print(f"{Fore.YELLOW}⚠ No last result found to generate report.{Style.RESET_ALL}")
         return
 
-    with open(LAST_RESULT_FILE, "r") as f:
-        data = json.load(f)
+    data = scan["payload"]
 
     if data.get("status") != "found":
         print(f"{Fore.YELLOW}⚠ No breaches found or error occurred. Nothing to report.{Style.RESET_ALL}")
@@ -148,7 +420,7 @@ def check_email(email: str):
         print(f"{Fore.RED}❌ Invalid email format.{Style.RESET_ALL}")
         return
 
-    result = leakcheck_lookup(email)
+    result = lookup_all(email)
 
     if result["status"] == "found":
         print(f"{Fore.RED}⚠ Breach FOUND in {result['found']} sources!{Style.RESET_ALL}\n")
@@ -167,16 +439,185 @@ def check_email(email: str):
         print(f"{Fore.YELLOW}⚠ Could not check {email} due to API error.{Style.RESET_ALL}")
 
     # Save and generate report
-    save_last_result(result)
-    generate_report()
+    save_result(result)
+    generate_report(email)
 
     return result
 
 
+# ---------------------------
+#  Bulk Check
+# ---------------------------
+def normalize_email(email):
+    """Trimmed, lower-cased address with an IDNA domain, or None if it is not an email."""
+    local, sep, domain = email.strip().lower().rpartition("@")
+    if not sep:
+        return None
+    try:
+        domain = domain.rstrip(".").encode("idna").decode("ascii")
+    except UnicodeError:
+        return None
+    email = f"{local}@{domain}"
+    return email if is_valid_email(email) else None
+
+
+def load_emails(source, rejected=None):
+    """Unique normalized emails from a file path ('-' for stdin) or an iterable.
+
+    Lines that are not valid addresses are appended to ``rejected`` if given.
+    """
+    if isinstance(source, str):
+        handle = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+        try:
+            return _unique_emails(handle, rejected)
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+    return _unique_emails(source, rejected)
+
+
+def _unique_emails(lines, rejected):
+    emails = {}
+    invalid = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        email = normalize_email(line)
+        if email is None:
+            invalid.setdefault(line, None)
+        else:
+            emails.setdefault(email, None)
+    if rejected is not None:
+        rejected.extend(invalid)
+    return list(emails)
+
+
+def create_session(concurrency=BULK_CONCURRENCY):
+    connector = aiohttp.TCPConnector(
+        limit=concurrency,
+        resolver=dns_cache.AiohttpResolver(),
+        use_dns_cache=False,
+    )
+    return aiohttp.ClientSession(connector=connector, headers={"User-Agent": USER_AGENT})
+
+
+async def iter_emails_bulk(emails, concurrency=BULK_CONCURRENCY, providers=None):
+    """Yield each email's merged result as it completes, paced to each provider's rate limit."""
+    emails = iter(emails)
+    providers = providers or default_providers(budget=None)
+    scheduler = create_scheduler(providers)
+    done = asyncio.Queue(maxsize=concurrency)
+
+    async with create_session(concurrency) as session:
+
+        async def worker():
+            for email in emails:
+                await done.put(await lookup_all_async(email, providers, session, scheduler))
+
+        async def run():
+            try:
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+            finally:
+                await done.put(None)
+
+        runner = asyncio.create_task(run())
+        try:
+            while True:
+                result = await done.get()
+                if result is None:
+                    break
+                yield result
+            await runner
+        finally:
+            runner.cancel()
+
+
+def _emit(result, out, save, on_result):
+    if out:
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+    save(result["email"], result)
+    if on_result:
+        on_result(result)
+
+
+def _progress(checked, total, start):
+    elapsed = time.perf_counter() - start
+    rate = checked / elapsed if elapsed > 0 else 0.0
+    eta = (total - checked) / rate if rate > 0 else 0.0
+    return (f"📊 {checked}/{total} checked ({checked * 100 / total:.1f}%) "
+            f"· {rate:.2f}/s · ETA {int(eta // 60)}m{int(eta % 60):02d}s")
+
+
+async def check_emails_bulk_async(source, output_path=BULK_OUTPUT_FILE,
+                                  concurrency=BULK_CONCURRENCY, providers=None,
+                                  on_result=None, validate=True):
+    """Check every address in ``source``, appending one JSON line per result to ``output_path``
+    (None to skip the file and rely on ``on_result``).
+
+    With ``validate`` on, addresses at domains that cannot receive mail are
+    written out as "undeliverable" without querying any provider. Every
+    result, undeliverable ones included, is recorded in the results store.
+    """
+    rejected = []
+    emails = load_emails(source, rejected)
+    undeliverable = []
+    if validate and emails:
+        emails, undeliverable = await validate_emails_async(emails)
+    total = len(emails)
+    summary = {"total": total + len(undeliverable), "invalid": len(rejected),
+               "undeliverable": len(undeliverable), "found": 0, "not_found": 0,
+               "error": 0, "output": output_path}
+
+    print(f"\n{Fore.CYAN}🔍 Checking {total} unique emails "
+          f"({len(rejected)} invalid, {len(undeliverable)} undeliverable skipped)"
+          f"{f' → {output_path}' if output_path else ''}{Style.RESET_ALL}\n")
+
+    start = time.perf_counter()
+    last_report = start
+    checked = 0
+    out = open(output_path, "a", encoding="utf-8") if output_path else None
+    try:
+        with results_store.get_store().writer("email") as save:
+            for email in undeliverable:
+                result = _leakcheck_result(email, "undeliverable", provider="MX check")
+                _emit(result, out, save, on_result)
+            if not total:
+                return summary
+
+            async for result in iter_emails_bulk(emails, concurrency, providers):
+                _emit(result, out, save, on_result)
+                checked += 1
+                summary[result["status"]] += 1
+
+                now = time.perf_counter()
+                if now - last_report >= PROGRESS_INTERVAL or checked == total:
+                    last_report = now
+                    print(f"\r{_progress(checked, total, start)}", end="", flush=True)
+    finally:
+        if out:
+            out.close()
+
+    summary["elapsed"] = time.perf_counter() - start
+    print(f"\n\n{Fore.RED}⚠ {summary['found']} breached{Style.RESET_ALL}, "
+          f"{Fore.GREEN}{summary['not_found']} clean{Style.RESET_ALL}, "
+          f"{Fore.YELLOW}{summary['error']} errors{Style.RESET_ALL} "
+          f"in {summary['elapsed']:.1f}s\n")
+    return summary
+
+
+def check_emails_bulk(source, **kwargs):
+    return asyncio.run(check_emails_bulk_async(source, **kwargs))
+
+
 # ---------------------------
 #  Main
 # ---------------------------
 if __name__ == "__main__":
-    email_to_check = input("Enter email to check: ").strip()
-    check_email(email_to_check)
+    if len(sys.argv) > 1:
+        check_emails_bulk(sys.argv[1])
+    else:
+        email_to_check = input("Enter email to check: ").strip()
+        check_email(email_to_check)
 
@@ -0,0 +1,251 @@
+import abc
+import csv
+import json
+import sys
+from datetime import datetime
+from colorama import Fore, Style
+from modules import results_store
+
+# Typed columns per module; every exported row has exactly these keys
+SCHEMAS = {
+    "username": (
+        ("scanned_at", "string"), ("username", "string"), ("platform", "string"),
+        ("found", "bool"), ("url", "string"), ("outcome", "string"),
+        ("http_status", "int64"), ("total_ms", "float64"),
+    ),
+    "email": (
+        ("scanned_at", "string"), ("email", "string"), ("status", "string"),
+        ("provider", "string"), ("breach_count", "int64"), ("fields", "string"),
+        ("source", "string"), ("source_date", "string"),
+    ),
+    "domain": (
+        ("scanned_at", "string"), ("domain", "string"), ("stage", "string"),
+        ("line", "int64"), ("key", "string"), ("value", "string"),
+    ),
+}
+
+PARQUET_BATCH_ROWS = 50000      # rows buffered per parquet row group
+PARQUET_COMPRESSION = "zstd"
+
+
+# ---------------------------
+#  Flattening
+# ---------------------------
+def _username_rows(result, scanned_at):
+    username = result.get("searched_username") or result.get("username")
+    for profile in result.get("profiles", []):
+        probe = profile.get("probe") or {}
+        yield {
+            "scanned_at": scanned_at,
+            "username": username,
+            "platform": profile.get("platform"),
+            "found": profile.get("found"),
+            "url": profile.get("url"),
+            "outcome": probe.get("outcome"),
+            "http_status": probe.get("status"),
+            "total_ms": (probe.get("timings") or {}).get("total"),
+        }
+
+
+def _email_rows(result, scanned_at):
+    row = {
+        "scanned_at": scanned_at,
+        "email": result.get("email"),
+        "status": result.get("status"),
+        "provider": result.get("provider"),
+        "breach_count": result.get("found", 0),
+        "fields": ";".join(result.get("fields", [])),
+        "source": None,
+        "source_date": None,
+    }
+    sources = result.get("sources") or []
+    if not sources:
+        yield row
+    for source in sources:
+        yield {**row, "source": source.get("name"), "source_date": source.get("date")}
+
+
+def _domain_rows(result, scanned_at, domain=None):
+    domain = domain or result.get("domain")
+    stages = result.get("report", result)
+    for stage, text in stages.items():
+        if stage == "domain":
+            continue
+        for line_no, line in enumerate(str(text).splitlines(), 1):
+            if not line.strip():
+                continue
+            key, sep, value = line.partition(": ")
+            yield {
+                "scanned_at": scanned_at,
+                "domain": domain,
+                "stage": stage,
+                "line": line_no,
+                "key": key.strip() if sep else None,
+                "value": value if sep else line,
+            }
+
+
+def flatten(module, result, target=None, scanned_at=None):
+    """Yield typed rows (see SCHEMAS) for one username, email or domain result."""
+    scanned_at = scanned_at or datetime.utcnow().isoformat()
+    if module == "username":
+        return _username_rows(result, scanned_at)
+    if module == "email":
+        return _email_rows(result, scanned_at)
+    if module == "domain":
+        return _domain_rows(result, scanned_at, target)
+    raise ValueError(f"Unknown module: {module}")
+
+
+# ---------------------------
+#  Exporters
+# ---------------------------
+class Exporter(abc.ABC):
+    """Writes flattened rows for one module as results arrive; use as a context manager."""
+
+    def __init__(self, path, module):
+        if module not in SCHEMAS:
+            raise ValueError(f"Unknown module: {module}")
+        self.path = path
+        self.module = module
+        self.columns = [name for name, _ in SCHEMAS[module]]
+        self.rows = 0
+
+    def write(self, result, target=None, scanned_at=None):
+        """Flatten and write one result; usable directly as a bulk run's on_result."""
+        for row in flatten(self.module, result, target, scanned_at):
+            self.write_row(row)
+            self.rows += 1
+
+    @abc.abstractmethod
+    def write_row(self, row):
+        """Write one flattened row."""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonlExporter(Exporter):
+    def __init__(self, path, module):
+        super().__init__(path, module)
+        self._out = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+
+    def write_row(self, row):
+        self._out.write(json.dumps(row) + "\n")
+
+    def close(self):
+        if self._out is sys.stdout:
+            self._out.flush()
+        else:
+            self._out.close()
+
+
+class CsvExporter(Exporter):
+    def __init__(self, path, module):
+        super().__init__(path, module)
+        self._out = sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._out, fieldnames=self.columns)
+        self._writer.writeheader()
+
+    def write_row(self, row):
+        self._writer.writerow(row)
+
+    def close(self):
+        if self._out is sys.stdout:
+            self._out.flush()
+        else:
+            self._out.close()
+
+
+def parquet_available():
+    """Whether the optional ``pyarrow`` package for ParquetExporter is installed."""
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        return False
+    return True
+
+
+class ParquetExporter(Exporter):
+    """Compressed columnar output; needs the optional ``pyarrow`` package.
+
+    Rows are buffered column-wise and flushed as one row group every
+    ``batch_rows``, so memory is bounded by the batch, not the export.
+    """
+
+    def __init__(self, path, module, batch_rows=PARQUET_BATCH_ROWS, compression=PARQUET_COMPRESSION):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from None
+        super().__init__(path, module)
+        self._pa = pa
+        self.schema = pa.schema([(name, pa.type_for_alias(kind)) for name, kind in SCHEMAS[module]])
+        self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        self.batch_rows = batch_rows
+        self._columns = {name: [] for name in self.columns}
+        self._buffered = 0
+
+    def write_row(self, row):
+        for name in self.columns:
+            self._columns[name].append(row[name])
+        self._buffered += 1
+        if self._buffered >= self.batch_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffered:
+            return
+        table = self._pa.Table.from_pydict(self._columns, schema=self.schema)
+        self._writer.write_table(table)
+        self._columns = {name: [] for name in self.columns}
+        self._buffered = 0
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+EXPORTERS = {
+    "jsonl": JsonlExporter,
+    "csv": CsvExporter,
+    "parquet": ParquetExporter,
+}
+
+
+def open_exporter(path, module, fmt=None):
+    """Exporter for ``path``; the format defaults to the file extension ('-' is JSONL to stdout)."""
+    if fmt is None:
+        fmt = "jsonl" if path == "-" else path.rsplit(".", 1)[-1].lower()
+        fmt = {"json": "jsonl", "ndjson": "jsonl", "pq": "parquet"}.get(fmt, fmt)
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown export format: {fmt} (choose from {', '.join(EXPORTERS)})")
+    return EXPORTERS[fmt](path, module)
+
+
+def export_store(path, module, fmt=None, store=None, **filters):
+    """Stream stored scans of ``module`` (filtered by target/since/until) into ``path``."""
+    store = store or results_store.get_store()
+    with open_exporter(path, module, fmt) as exporter:
+        for scan in store.query(module=module, newest_first=False, **filters):
+            exporter.write(scan["payload"], scan["target"], scan["taken_at"])
+    if path != "-":
+        print(f"{Fore.GREEN}✅ Exported {exporter.rows} {module} rows to {path}{Style.RESET_ALL}")
+    return exporter.rows
+
+
+# ---------------------------
+#  Main
+# ---------------------------
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        export_store(sys.argv[1], sys.argv[2], target=sys.argv[3] if len(sys.argv) > 3 else None)
+    else:
+        print("Usage: python exporters.py OUTPUT username|email|domain [TARGET]")
@@ -0,0 +1,87 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "CyberEye-Recon/1.0"
+HTTP_TIMEOUT = 6
+POOL_CONNECTIONS = 64       # distinct hosts kept in the pool
+POOL_MAXSIZE = 16           # keep-alive connections per host
+CHUNK_SIZE = 4096
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """The process-wide keep-alive session shared by the recon stages."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers["User-Agent"] = USER_AGENT
+                _session = session
+    return _session
+
+
+def head(url, timeout=HTTP_TIMEOUT, **kwargs):
+    return get_session().head(url, timeout=timeout, allow_redirects=True, **kwargs)
+
+
+def fetch_capped(url, max_bytes, timeout=HTTP_TIMEOUT, **kwargs):
+    """GET ``url`` but read at most ``max_bytes`` of the body.
+
+    Returns (response, text). A body that fits is read to the end so the
+    connection goes back to the pool; a larger one is cut off and its
+    connection dropped rather than downloading the rest.
+    """
+    resp = get_session().get(url, timeout=timeout, stream=True, **kwargs)
+    chunks = []
+    size = 0
+    truncated = False
+    try:
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                truncated = True
+                break
+    finally:
+        resp.close()
+    body = b"".join(chunks)[:max_bytes]
+    try:
+        text = body.decode(resp.encoding or "utf-8", errors="replace")
+    except LookupError:
+        text = body.decode("utf-8", errors="replace")
+    resp.truncated = truncated
+    return resp, text
+
+
+# ---------------------------
+#  Conditional Requests
+# ---------------------------
+def conditional_headers(validators):
+    """If-None-Match / If-Modified-Since headers from a stored validators dict."""
+    headers = {}
+    if validators and validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators and validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def validators_of(resp):
+    return {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }
+
+
+def revalidated(validators, resp):
+    """Stored validators updated from a 304, which may omit the ones it didn't change."""
+    fresh = {key: value for key, value in validators_of(resp).items() if value}
+    return {**(validators or {}), **fresh}
@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
-import os, json
-from modules import username_check, email_breach, domain_info, report_generator
+import os, sys, json, argparse, asyncio, contextlib, itertools
+from modules import username_check, email_breach, domain_info, report_generator, result_cache, dns_cache
+from modules import exporters, results_store, snapshots
 
-LAST_RESULTS_FILE = "last_results.json"
+SCAN_MODULES = ("username", "email", "domain")
+SCAN_FORMATS = ("jsonl", "rows", "csv", "parquet")
 
 def banner():
     print("="*80)
@@ -41,8 +43,8 @@ def instructions():
     print("   • Enter any domain (example: google.com).")
     print("")
     print("4. Generate HTML Report:")
-    print("   • Creates a complete HTML report from last scan.")
-    print("   • Report auto-saves and opens in browser.")
+    print("   • Creates an HTML report from saved scans.")
+    print("   • Covers this session, one saved target, or 'all' saved scans.")
     print("")
     print("5. Help / Instructions:")
     print("   • Shows this help guide for users.")
@@ -50,7 +52,8 @@ def instructions():
     print("6. Exit:")
     print("   • Close the tool safely.")
     print("-----------------------------------------")
-    print("💡 Tip: Scan results auto-save in 'last_results.json'.")
+    print("💡 Tip: Every scan is kept in 'osint_results.db'.")
+    print("💡 Tip: Lookups are cached in 'osint_cache.db'; run with --no-cache to bypass.")
     print("💡 Tip: Reports save inside the 'reports' folder.")
     print("-----------------------------------------\n")
 
@@ -59,23 +62,11 @@ def menu():
     print("\n1) Username Investigation")
     print("2) Email Breach Check")
     print("3) Domain Reconnaissance")
-    print("4) Generate HTML Report from Last Results")
+    print("4) Generate HTML Report from Saved Results")
     print("5) Help / Instructions")
     print("6) Exit")
 
 
-def save_last_results(data):
-    with open(LAST_RESULTS_FILE, "w") as f:
-        json.dump(data, f, indent=4)
-
-
-def load_last_results():
-    if not os.path.exists(LAST_RESULTS_FILE):
-        return None
-    with open(LAST_RESULTS_FILE, "r") as f:
-        return json.load(f)
-
-
 def print_result(result, title):
     print(f"\n🌐 {title} Result:\n")
     for key, value in result.items():
@@ -92,7 +83,147 @@ def print_result(result, title):
     print("\n✅ Recon finished.")
 
 
+def print_cache_stats(file=None):
+    stats = result_cache.get_cache().stats()
+    print(f"\n🗄  Cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"({stats['hit_rate']:.0%} hit rate)", file=file)
+    stats = dns_cache.stats()
+    print(f"🧭 DNS: {stats['hits']} cached, {stats['coalesced']} shared, "
+          f"{stats['misses']} queried ({stats['hit_rate']:.0%} hit rate)", file=file)
+
+
+def print_probe_stats():
+    """Per-platform probe timings for every username scan made this session."""
+    if username_check.PROBE_STATS.platforms:
+        print(f"\n⏱  Probe timings per platform:\n{username_check.PROBE_STATS.format()}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CyberEye OSINT Machine")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignore and do not update the on-disk lookup cache")
+    commands = parser.add_subparsers(dest="command")
+
+    scan = commands.add_parser(
+        "scan", help="scan targets without the menu, streaming results as JSONL",
+        description="Scan targets from arguments, --input or stdin. Results go to "
+                    "--output (stdout by default); progress goes to stderr.")
+    scan.add_argument("module", choices=SCAN_MODULES)
+    scan.add_argument("targets", nargs="*", help="targets to scan")
+    scan.add_argument("-i", "--input", metavar="FILE",
+                      help="file with one target per line ('-' for stdin)")
+    scan.add_argument("-c", "--concurrency", type=int,
+                      help="checks (username/email) or domains in flight at once")
+    scan.add_argument("-t", "--timeout", type=float,
+                      help="seconds per request (username/email) or per recon stage (domain)")
+    scan.add_argument("-f", "--format", choices=SCAN_FORMATS, default="jsonl",
+                      help="jsonl: one full result per line; rows/csv/parquet: flattened rows")
+    scan.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    scan.add_argument("--no-cache", action="store_true", default=argparse.SUPPRESS,
+                      help="ignore and do not update the on-disk lookup cache")
+    scan.add_argument("--clear-cache", action="store_true",
+                      help="empty the on-disk lookup cache before scanning")
+    scan.add_argument("--no-validate", action="store_true",
+                      help="email: skip the MX check that drops undeliverable domains")
+
+    rescan = commands.add_parser(
+        "rescan", help="re-scan targets and print only what changed since their last snapshot",
+        description="Re-scan domains and usernames, compare each with its last snapshot "
+                    "(kept under 'snapshots/') and print the differences.")
+    rescan.add_argument("-d", "--domain", action="append", default=[], help="domain to re-scan (repeatable)")
+    rescan.add_argument("-u", "--username", action="append", default=[], help="username to re-scan (repeatable)")
+    rescan.add_argument("-w", "--watchlist", metavar="FILE",
+                        help='file of "domain NAME" / "username NAME" lines')
+    rescan.add_argument("--no-cache", action="store_true", default=argparse.SUPPRESS,
+                        help="ignore and do not update the on-disk lookup cache")
+
+    args = parser.parse_args(argv)
+    if args.command == "rescan" and not (args.domain or args.username or args.watchlist):
+        parser.error("give --domain, --username or --watchlist")
+    if args.command == "scan":
+        if args.format == "parquet" and args.output == "-":
+            parser.error("parquet output needs --output FILE")
+        if args.format == "parquet" and not exporters.parquet_available():
+            parser.error("parquet output needs pyarrow (pip install pyarrow)")
+        if not (args.targets or args.input) and sys.stdin.isatty():
+            parser.error("give targets as arguments, with --input, or on stdin")
+    return args
+
+
+# ============================
+# 📌 HEADLESS SCANS
+# ============================
+def scan_targets(args, stack):
+    """Targets from arguments, then --input, or stdin when neither is given."""
+    sources = [args.targets]
+    if args.input == "-" or not (args.targets or args.input):
+        sources.append(sys.stdin)
+    elif args.input:
+        sources.append(stack.enter_context(open(args.input, "r", encoding="utf-8")))
+    return itertools.chain.from_iterable(sources)
+
+
+def scan_writer(args, stack):
+    """Callable taking one result and writing it in the chosen format."""
+    if args.format != "jsonl":
+        fmt = "jsonl" if args.format == "rows" else args.format
+        return stack.enter_context(exporters.open_exporter(args.output, args.module, fmt)).write
+
+    out = sys.stdout if args.output == "-" else stack.enter_context(
+        open(args.output, "w", encoding="utf-8"))
+
+    def write(result):
+        out.write(json.dumps(result, default=str) + "\n")
+        out.flush()
+    return write
+
+
+def run_scan(args):
+    if args.clear_cache:
+        result_cache.get_cache().clear()
+    concurrency = {"concurrency": args.concurrency} if args.concurrency else {}
+    timeout = {"timeout": args.timeout} if args.timeout else {}
+
+    with contextlib.ExitStack() as stack:
+        targets = scan_targets(args, stack)
+        write = scan_writer(args, stack)
+        # Scanner chatter goes to stderr so stdout carries only results
+        stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+
+        if args.module == "username":
+            asyncio.run(username_check.search_usernames_bulk_async(
+                targets, on_result=write, keep_results=False, **concurrency, **timeout))
+        elif args.module == "email":
+            asyncio.run(email_breach.check_emails_bulk_async(
+                targets, output_path=None, on_result=write, validate=not args.no_validate,
+                providers=email_breach.default_providers(args.timeout, budget=None), **concurrency))
+        else:
+            domain_info.domain_recon_bulk(targets, None, on_result=write, timeout=args.timeout,
+                                          workers=args.concurrency or domain_info.BULK_WORKERS)
+    print_cache_stats(sys.stderr)
+
+
+def run_rescan(args):
+    domains, usernames = list(args.domain), list(args.username)
+    if args.watchlist:
+        listed_domains, listed_usernames = snapshots.load_watchlist(args.watchlist)
+        domains += listed_domains
+        usernames += listed_usernames
+    snapshots.rescan_watchlist(domains, usernames)
+    print_cache_stats()
+
+
 def main():
+    args = parse_args()
+    if args.no_cache:
+        result_cache.set_enabled(False)
+    if args.command == "scan":
+        run_scan(args)
+        return
+    if args.command == "rescan":
+        run_rescan(args)
+        return
+
     while True:
         os.system('cls' if os.name=='nt' else 'clear')
 
@@ -106,27 +237,18 @@ def main():
             username = input("Enter username: ").strip()
             if username:
                 result = username_check.search_username(username)
-                save_last_results({"username_investigation": result})
-                report_generator.add_username_result(result, force=True)
+                results_store.record("username", username, result)
 
         # EMAIL
         elif choice == '2':
             email = input("Enter email: ").strip()
             if email:
                 result = email_breach.check_email(email)
-                save_last_results({"email_breach_check": result})
+                if not result:
+                    input("\nPress Enter to continue...")
+                    continue
 
-                report_generator.add_email_result({
-                    "email": email,
-                    "report": (
-                        f"Status: {result['status']}\n"
-                        f"Found in {result.get('found', 0)} sources\nSources:\n" +
-                        "\n".join([
-                            f"{s.get('name')} - {s.get('date', 'Unknown')}"
-                            for s in result.get('sources', [])
-                        ])
-                    )
-                }, force=True)
+                report_generator.add_email_result(report_generator.email_entry(result))
 
                 print_result({
                     "email": email,
@@ -142,12 +264,9 @@ def main():
                 if "domain" not in result:
                     result["domain"] = domain
 
-                save_last_results({"domain_recon": result})
+                results_store.record("domain", domain, result)
 
-                report_generator.add_domain_result({
-                    "domain": domain,
-                    "report": "\n".join([f"{k}: {v}" for k, v in result.items()])
-                }, force=True)
+                report_generator.add_domain_result(report_generator.domain_entry(domain, result))
 
                 print_result({
                     "domain": domain,
@@ -156,46 +275,11 @@ def main():
 
         # REPORT
         elif choice == '4':
-            data = load_last_results()
-            if not data:
-                print("\n⚠ No previous results found to generate report.")
-                input("\nPress Enter to continue...")
-                continue
-
-            report_generator.CHECKED_EMAILS.clear()
-            report_generator.CHECKED_DOMAINS.clear()
-            report_generator.CHECKED_USERNAMES.clear()
-
-            # EMAIL
-            if "email_breach_check" in data:
-                d = data["email_breach_check"]
-                report_generator.add_email_result({
-                    "email": d.get("email", "Unknown"),
-                    "report": (
-                        f"Status: {d['status']}\n"
-                        f"Found in {d.get('found',0)} sources\nSources:\n" +
-                        "\n".join([
-                            f"{s.get('name')} - {s.get('date','Unknown')}"
-                            for s in d.get('sources', [])
-                        ])
-                    )
-                }, force=True)
-
-            # DOMAIN
-            if "domain_recon" in data:
-                d = data["domain_recon"]
-                report_generator.add_domain_result({
-                    "domain": d.get("domain", "Unknown"),
-                    "report": "\n".join([f"{k}: {v}" for k, v in d.items()])
-                }, force=True)
-
-            # USERNAME
-            if "username_investigation" in data:
-                report_generator.add_username_result(
-                    data["username_investigation"], force=True
-                )
-
-            report_generator.generate_html_report()
+            target = input("Target to report on (blank for this session, 'all' for every saved scan): ").strip()
+            if not target:
+                report_generator.get_collector().generate_report()
+            else:
+                report_generator.generate_report_from_store(target=None if target.lower() == "all" else target)
 
         # HELP OPTION
         elif choice == '5':
@@ -206,6 +290,8 @@ def main():
 
         # EXIT
         elif choice == '6' or choice.lower() == 'exit':
+            print_probe_stats()
+            print_cache_stats()
             break
 
         else:
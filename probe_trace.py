@@ -0,0 +1,155 @@
+import time
+import aiohttp
+
+# Phases recorded per probe, in milliseconds. aiohttp reports TCP connect and
+# TLS handshake as one "connection create" step that also wraps host
+# resolution, so "connect" is timed from the end of DNS and covers both.
+PHASES = ("dns", "connect", "ttfb", "download", "total")
+BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 15000)
+
+
+def new_probe():
+    """Per-probe record filled in by the trace hooks and check_single_site."""
+    return {"outcome": None, "status": None, "rule": None, "attempts": 0, "timings": {}}
+
+
+def _ms(start, end):
+    return round((end - start) * 1000, 1)
+
+
+# ---------------------------
+#  aiohttp Trace Hooks
+# ---------------------------
+def create_trace_config():
+    """TraceConfig that writes phase timings into the request's trace_request_ctx probe."""
+    trace = aiohttp.TraceConfig()
+
+    def probe_of(ctx):
+        return ctx.trace_request_ctx if isinstance(ctx.trace_request_ctx, dict) else None
+
+    async def on_request_start(session, ctx, params):
+        probe = probe_of(ctx)
+        if probe is not None:
+            probe["attempts"] += 1
+            # Each attempt starts a fresh set of timings
+            probe["timings"] = {}
+            probe["_start"] = time.perf_counter()
+
+    async def on_dns_start(session, ctx, params):
+        ctx.dns_start = time.perf_counter()
+
+    async def on_dns_end(session, ctx, params):
+        now = time.perf_counter()
+        # Resolution runs inside connection create; the connect clock starts after it
+        ctx.connect_start = now
+        probe = probe_of(ctx)
+        if probe is not None:
+            probe["timings"]["dns"] = _ms(ctx.dns_start, now)
+
+    async def on_dns_cache_hit(session, ctx, params):
+        ctx.connect_start = time.perf_counter()
+        probe = probe_of(ctx)
+        if probe is not None:
+            probe["timings"]["dns"] = 0.0
+
+    async def on_connection_start(session, ctx, params):
+        ctx.connect_start = time.perf_counter()
+
+    async def on_connection_end(session, ctx, params):
+        probe = probe_of(ctx)
+        if probe is not None:
+            probe["timings"]["connect"] = _ms(ctx.connect_start, time.perf_counter())
+
+    async def on_connection_reused(session, ctx, params):
+        probe = probe_of(ctx)
+        if probe is not None:
+            probe["timings"]["connect"] = 0.0
+
+    async def on_request_end(session, ctx, params):
+        probe = probe_of(ctx)
+        if probe is not None:
+            probe["_headers_at"] = time.perf_counter()
+            probe["timings"]["ttfb"] = _ms(probe["_start"], probe["_headers_at"])
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_dns_resolvehost_start.append(on_dns_start)
+    trace.on_dns_resolvehost_end.append(on_dns_end)
+    trace.on_dns_cache_hit.append(on_dns_cache_hit)
+    trace.on_connection_create_start.append(on_connection_start)
+    trace.on_connection_create_end.append(on_connection_end)
+    trace.on_connection_reuseconn.append(on_connection_reused)
+    trace.on_request_end.append(on_request_end)
+    return trace
+
+
+def finish_probe(probe, outcome, status=None, rule=None):
+    """Record the probe's outcome and close its download/total timings."""
+    now = time.perf_counter()
+    probe["outcome"] = outcome
+    probe["status"] = status
+    probe["rule"] = rule
+    if "_headers_at" in probe:
+        probe["timings"]["download"] = _ms(probe["_headers_at"], now)
+    if "_start" in probe:
+        probe["timings"]["total"] = _ms(probe["_start"], now)
+    probe.pop("_start", None)
+    probe.pop("_headers_at", None)
+    return probe
+
+
+# ---------------------------
+#  Aggregate Histogram
+# ---------------------------
+def bucket_label(ms):
+    for bound in BUCKETS_MS:
+        if ms <= bound:
+            return f"<={bound}ms"
+    return f">{BUCKETS_MS[-1]}ms"
+
+
+class ProbeStats:
+    """Per-platform phase histograms and outcome counts across many probes."""
+
+    def __init__(self):
+        self.platforms = {}
+
+    def record(self, platform, probe):
+        entry = self.platforms.setdefault(platform, {
+            "count": 0,
+            "outcomes": {},
+            "phases": {phase: {} for phase in PHASES},
+        })
+        entry["count"] += 1
+        outcome = probe.get("outcome") or "unknown"
+        entry["outcomes"][outcome] = entry["outcomes"].get(outcome, 0) + 1
+        for phase, ms in probe.get("timings", {}).items():
+            buckets = entry["phases"][phase]
+            label = bucket_label(ms)
+            buckets[label] = buckets.get(label, 0) + 1
+
+    def histogram(self):
+        return self.platforms
+
+    def format(self):
+        return format_histogram(self.platforms)
+
+
+def format_histogram(platforms):
+    """Text table of a ProbeStats.histogram(), one block per platform."""
+    lines = []
+    for platform, entry in platforms.items():
+        outcomes = ", ".join(f"{k}={v}" for k, v in sorted(entry["outcomes"].items()))
+        lines.append(f"{platform} ({entry['count']} probes): {outcomes}")
+        for phase in PHASES:
+            buckets = entry["phases"][phase]
+            if buckets:
+                ordered = sorted(buckets.items(), key=lambda kv: _bucket_order(kv[0]))
+                lines.append(f"  {phase:<8} " + "  ".join(f"{k}:{v}" for k, v in ordered))
+    return "\n".join(lines)
+
+
+def _bucket_order(label):
+    for i, bound in enumerate(BUCKETS_MS):
+        if label == f"<={bound}ms":
+            return i
+    return len(BUCKETS_MS)
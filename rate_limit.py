@@ -0,0 +1,152 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# ---------------------------
+#  Defaults
+# ---------------------------
+DEFAULT_RATE = 2.0          # requests per second per key
+MAX_RETRIES = 3             # extra attempts for a single request
+RETRY_BUDGET_RATIO = 0.2    # retries allowed as a share of first attempts
+RETRY_BUDGET_MIN = 10       # retries always allowed, even for tiny runs
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+MIN_RATE_FACTOR = 0.1       # adaptive rate never drops below 10% of the base
+
+
+# ---------------------------
+#  Helpers
+# ---------------------------
+def parse_retry_after(value):
+    """Return the Retry-After header as seconds (delta or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Exponential backoff with equal jitter for the given retry attempt (0-based)."""
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+# ---------------------------
+#  Token Bucket
+# ---------------------------
+class TokenBucket:
+    """Async token bucket whose rate shrinks on throttling and recovers on success."""
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=None):
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def try_acquire(self):
+        """Take a token only if one is free now and nobody is waiting for it."""
+        if self._lock.locked():
+            return False
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return False
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def pause(self, seconds):
+        """Hold every caller of this bucket for ``seconds`` (e.g. Retry-After)."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def throttled(self):
+        self.rate = max(self.base_rate * MIN_RATE_FACTOR, self.rate / 2)
+
+    def succeeded(self):
+        self.rate = min(self.base_rate, self.rate + self.base_rate * 0.1)
+
+
+# ---------------------------
+#  Scheduler
+# ---------------------------
+class RateLimitScheduler:
+    """Keeps one token bucket per key and a shared retry budget.
+
+    Keys are usually platform or host names, so a throttled key slows down
+    without stalling requests to any other key.
+    """
+
+    def __init__(self, rates=None, default_rate=DEFAULT_RATE, max_retries=MAX_RETRIES,
+                 budget_ratio=RETRY_BUDGET_RATIO, budget_min=RETRY_BUDGET_MIN):
+        self.rates = dict(rates or {})
+        self.default_rate = default_rate
+        self.max_retries = max_retries
+        self.budget_ratio = budget_ratio
+        self.budget_min = budget_min
+        self.buckets = {}
+        self.attempts = 0
+        self.retries = 0
+
+    def bucket(self, key):
+        if key not in self.buckets:
+            self.buckets[key] = TokenBucket(self.rates.get(key, self.default_rate))
+        return self.buckets[key]
+
+    async def acquire(self, key, attempt=0):
+        if attempt == 0:
+            self.attempts += 1
+        await self.bucket(key).acquire()
+
+    def try_acquire(self, key):
+        """Non-blocking acquire for optional extra requests (e.g. hedges)."""
+        return self.bucket(key).try_acquire()
+
+    def can_retry(self, attempt):
+        """True if a request on its ``attempt``-th try may be retried."""
+        if attempt >= self.max_retries:
+            return False
+        return self.retries < self.budget_min + self.attempts * self.budget_ratio
+
+    async def retry_wait(self, key, attempt, retry_after=None, throttled=False):
+        """Sleep before the next attempt; throttling also slows the whole key."""
+        self.retries += 1
+        bucket = self.bucket(key)
+        delay = backoff_delay(attempt)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, BACKOFF_CAP))
+        if throttled:
+            bucket.throttled()
+            bucket.pause(delay)
+        await asyncio.sleep(delay)
+
+    def succeeded(self, key):
+        self.bucket(key).succeeded()
@@ -4,26 +4,76 @@ import html
 from datetime import datetime
 from colorama import Fore, Style
 import tempfile
+from modules import results_store
 
-# ---------------- Memory Storage for OSINT Results ---------------- #
-CHECKED_EMAILS = []
-CHECKED_DOMAINS = []
-CHECKED_USERNAMES = []
+# ---------------- Result Collector ---------------- #
+class ResultCollector:
+    """Results of one session or job, safe to fill from concurrent threads and tasks.
+
+    Producers only ever append (kind, result) to one list, which is atomic
+    under the GIL, so the hot path takes no lock. snapshot() copies the list
+    with a single slice, so a report sees every result added before it and
+    none half-way through. Worker processes should send results back to
+    their parent, or record them in results_store, rather than share this.
+    """
+
+    KINDS = ("email", "domain", "username")
+
+    def __init__(self):
+        self._entries = []
+
+    def add(self, kind, result):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown result kind: {kind}")
+        if result:
+            self._entries.append((kind, result))
+
+    def add_email(self, result):
+        self.add("email", result)
+
+    def add_domain(self, result):
+        self.add("domain", result)
+
+    def add_username(self, result):
+        self.add("username", result)
+
+    def snapshot(self):
+        """{kind: [results]} as of this instant, in arrival order."""
+        entries = self._entries[:]
+        sections = {kind: [] for kind in self.KINDS}
+        for kind, result in entries:
+            sections[kind].append(result)
+        return sections
+
+    def __len__(self):
+        return len(self._entries)
+
+    def generate_report(self, path=None):
+        sections = self.snapshot()
+        return generate_html_report(sections["email"], sections["domain"], sections["username"], path)
+
+
+# Collector for the interactive session; jobs can create their own
+_collector = ResultCollector()
+
+
+def get_collector():
+    return _collector
+
+# ---------------- Report Settings ---------------- #
+# Entries rendered up front per section; the rest wait in inert <template>
+# pages that the browser only builds when scrolled to or clicked.
+PAGE_SIZE = 200
+
+URL_PATTERN = re.compile(r'(https?://[^\s]+)')
 
 # ---------------- Utility Functions ---------------- #
 def make_clickable(text):
     """Convert URLs in text to clickable HTML links."""
-    url_pattern = r'(https?://[^\s]+)'
-    return re.sub(url_pattern, r'<a href="\1" target="_blank">\1</a>', text)
+    return URL_PATTERN.sub(r'<a href="\1" target="_blank">\1</a>', text)
 
 # ---------------- Report Generation ---------------- #
-def generate_html_report():
-    """Generate HTML report in memory and print browser link with download button."""
-    if not (CHECKED_EMAILS or CHECKED_DOMAINS or CHECKED_USERNAMES):
-        print(f"{Fore.YELLOW}⚠ No data to generate report.{Style.RESET_ALL}")
-        return None
-
-    html_content = f"""
+REPORT_HEAD = """
 <html>
 <head>
     <title>CyberEye OSINT Report</title>
@@ -37,49 +87,38 @@ def generate_html_report():
         a:hover {{ text-decoration: underline; }}
         .download-btn {{ display:inline-block; margin:10px 0; padding:8px 12px; background:#2b5797; color:white; border-radius:5px; text-decoration:none; }}
         .download-btn:hover {{ background:#1a3e70; }}
+        .more {{ margin:0 0 15px; padding:8px 12px; border:1px solid #2b5797; background:white; color:#2b5797; border-radius:5px; cursor:pointer; }}
     </style>
 </head>
 <body>
     <h1>CyberEye — OSINT Report</h1>
-    <small>Generated: {datetime.now()}</small>
+    <small>Generated: {generated}</small>
     <hr>
     <a class="download-btn" id="downloadBtn">⬇ Download Report</a>
     <div id="reportContent">
 """
 
-    # ---------------- Emails ---------------- #
-    for idx, data in enumerate(CHECKED_EMAILS, 1):
-        email_val = data.get("email") or data.get("searched_email")
-        if not email_val:
-            continue
-        html_content += f"<div class='box'><h3>Email {idx}: {html.escape(email_val)}</h3><pre>"
-        html_content += format_terminal_style_report(data)
-        html_content += "</pre></div>"
-
-    # ---------------- Domains ---------------- #
-    for idx, data in enumerate(CHECKED_DOMAINS, 1):
-        domain_val = data.get("domain")
-        if not domain_val:
-            continue
-        html_content += f"<div class='box'><h3>Domain {idx}: {html.escape(domain_val)}</h3><pre>"
-        html_content += format_terminal_style_report(data)
-        html_content += "</pre></div>"
-
-    # ---------------- Usernames ---------------- #
-    for idx, data in enumerate(CHECKED_USERNAMES, 1):
-        username_val = data.get("username") or data.get("searched_username")
-        if not username_val:
-            continue
-        html_content += f"<div class='box'><h3>Username {idx}: {html.escape(username_val)}</h3><pre>"
-        html_content += format_terminal_style_report(data)
-        html_content += "</pre></div>"
-
-    html_content += """
+REPORT_TAIL = """
     </div>
     <script>
+    document.querySelectorAll('.section').forEach(function(section) {
+        const more = section.querySelector('.more');
+        if (!more) return;
+        const showNext = function() {
+            const page = section.querySelector('template.page');
+            if (page) page.replaceWith(page.content);
+            if (!section.querySelector('template.page')) more.remove();
+        };
+        more.addEventListener('click', showNext);
+        new IntersectionObserver(function(entries) {
+            if (entries[0].isIntersecting) showNext();
+        }).observe(more);
+    });
+
     const downloadBtn = document.getElementById('downloadBtn');
     downloadBtn.addEventListener('click', function() {
-        const content = document.getElementById('reportContent').innerHTML;
+        // The whole page, so pages not yet shown keep working in the saved copy
+        const content = '<!DOCTYPE html>' + document.documentElement.outerHTML;
         const blob = new Blob([content], { type: 'text/html' });
         const a = document.createElement('a');
         a.href = URL.createObjectURL(blob);
@@ -91,59 +130,164 @@ def generate_html_report():
 </html>
 """
 
-    with tempfile.NamedTemporaryFile('w', delete=False, suffix=".html", encoding="utf-8") as tmp:
-        tmp.write(html_content)
-        temp_path = tmp.name
+SECTIONS = (
+    ("Email", lambda data: data.get("email") or data.get("searched_email")),
+    ("Domain", lambda data: data.get("domain")),
+    ("Username", lambda data: data.get("username") or data.get("searched_username")),
+)
+
+
+def write_section(out, label, results, key):
+    """Stream one section's boxes to ``out``, opening a new <template> page every PAGE_SIZE entries."""
+    out.write("<div class='section'>")
+    shown = 0
+    for idx, data in enumerate(results, 1):
+        value = key(data)
+        if not value:
+            continue
+        if shown and shown % PAGE_SIZE == 0:
+            if shown > PAGE_SIZE:
+                out.write("</template>")
+            out.write("<template class='page'>")
+        out.write(f"<div class='box'><h3>{label} {idx}: {html.escape(value)}</h3><pre>")
+        out.write(format_terminal_style_report(data))
+        out.write("</pre></div>\n")
+        shown += 1
+    if shown > PAGE_SIZE:
+        out.write(f"</template><button class='more'>Show more {label.lower()}s</button>")
+    out.write("</div>\n")
+    return shown
+
+
+def write_html_report(out, emails=(), domains=(), usernames=()):
+    """Write a full report to the open text file ``out`` as results are read.
+
+    Each argument may be any iterable, including a generator over a results
+    file or store, so nothing beyond one entry is held in memory.
+    """
+    out.write(REPORT_HEAD.format(generated=datetime.now()))
+    shown = 0
+    for (label, key), results in zip(SECTIONS, (emails, domains, usernames)):
+        shown += write_section(out, label, results, key)
+    out.write(REPORT_TAIL)
+    return shown
+
+
+def generate_html_report(emails=None, domains=None, usernames=None, path=None):
+    """Generate HTML report file and print browser link with download button.
+
+    Sections default to a snapshot of the session collector; ``path``
+    defaults to a new temporary file.
+    """
+    snapshot = _collector.snapshot()
+    sections = [
+        snapshot["email"] if emails is None else emails,
+        snapshot["domain"] if domains is None else domains,
+        snapshot["username"] if usernames is None else usernames,
+    ]
+    if all(isinstance(results, (list, tuple)) and not results for results in sections):
+        print(f"{Fore.YELLOW}⚠ No data to generate report.{Style.RESET_ALL}")
+        return None
+
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".html")
+        os.close(fd)
+    with open(path, "w", encoding="utf-8", buffering=1024 * 1024) as out:
+        write_html_report(out, *sections)
 
     print(f"\n✅ Report generated")
-    print(f"Open this link in browser to view: file://{os.path.abspath(temp_path)}")
+    print(f"Open this link in browser to view: file://{os.path.abspath(path)}")
     print("Click '⬇ Download Report' in browser to save the file.\n")
-    return temp_path
+    return path
+
+def generate_report_from_store(store=None, module=None, target=None, since=None, until=None,
+                               path=None):
+    """Generate an HTML report from stored scans (all history unless filtered)."""
+    store = store or results_store.get_store()
+    if not any(True for _ in store.query(module=module, target=target, since=since,
+                                         until=until, limit=1)):
+        print(f"{Fore.YELLOW}⚠ No stored results match.{Style.RESET_ALL}")
+        return None
+
+    def entries(kind):
+        if module not in (None, kind):
+            return
+        for scan in store.query(module=kind, target=target, since=since, until=until):
+            yield report_entry(kind, scan["target"], scan["payload"])
+
+    return generate_html_report(entries("email"), entries("domain"), entries("username"), path)
+
+
+# ---------------- Report Entries ---------------- #
+def email_entry(result):
+    """Report entry for an email_breach result dict."""
+    return {
+        "email": result.get("email", "Unknown"),
+        "report": (
+            f"Status: {result['status']}\n"
+            f"Found in {result.get('found', 0)} sources\nSources:\n" +
+            "\n".join([
+                f"{s.get('name')} - {s.get('date', 'Unknown')}"
+                for s in result.get('sources', [])
+            ])
+        )
+    }
+
+
+def domain_entry(domain, result):
+    """Report entry for a domain_info.domain_recon result dict."""
+    return {
+        "domain": result.get("domain", domain),
+        "report": "\n".join([f"{k}: {v}" for k, v in result.items()])
+    }
+
+
+def report_entry(module, target, result):
+    if module == "email":
+        return email_entry(result)
+    if module == "domain":
+        return domain_entry(target, result)
+    return result
 
 # ---------------- Format terminal style ---------------- #
 def format_terminal_style_report(data):
     """Formats a single OSINT result dict like terminal output with ✔ / ❌ and clickable links."""
-    output = ''
+    lines = []
 
     if 'profiles' in data and data['profiles']:
         for item in data['profiles']:
             platform = item.get('platform', 'Unknown')
             found = item.get('found', False)
             url = item.get('url')
-            status = '✅ FOUND' if found else '❌ Not Found'
+            if found:
+                status = '✅ FOUND'
+            elif found is None:
+                status = '⚠ Unknown'
+            else:
+                status = '❌ Not Found'
             url_display = f": {make_clickable(html.escape(url))}" if url else ''
-            output += f"{status} | {platform}{url_display}\n"
+            lines.append(f"{status} | {html.escape(platform)}{url_display}\n")
 
         # Total found count
         total_found = data.get('total_found', 0)
-        output += '\n--------------------------------\n'
-        output += f'Total Profiles Found: {total_found}\n'
+        lines.append('\n--------------------------------\n')
+        lines.append(f'Total Profiles Found: {total_found}\n')
 
     elif 'report' in data:
         # fallback for emails/domains
-        output += data['report'] + '\n'
+        lines.append(make_clickable(html.escape(data['report'])) + '\n')
 
     else:
-        output += 'No data available.\n'
+        lines.append('No data available.\n')
 
-    return output
+    return ''.join(lines)
 
 # ---------------- Add results safely ---------------- #
-def add_email_result(result, force=False):
-    if force:
-        CHECKED_EMAILS.clear()
-    if result:
-        CHECKED_EMAILS.append(result)
-
-def add_domain_result(result, force=False):
-    if force:
-        CHECKED_DOMAINS.clear()
-    if result:
-        CHECKED_DOMAINS.append(result)
-
-def add_username_result(result, force=False):
-    if force:
-        CHECKED_USERNAMES.clear()
-    if result:
-        CHECKED_USERNAMES.append(result)
+def add_email_result(result, collector=None):
+    (collector if collector is not None else _collector).add_email(result)
+
+def add_domain_result(result, collector=None):
+    (collector if collector is not None else _collector).add_domain(result)
 
+def add_username_result(result, collector=None):
+    (collector if collector is not None else _collector).add_username(result)
@@ -0,0 +1,186 @@
+import functools
+import json
+import sqlite3
+import threading
+import time
+
+CACHE_FILE = "osint_cache.db"
+MAX_ENTRIES = 50000
+
+# Seconds a positive result stays fresh, looked up by (module, source) first,
+# then by module. Negative results ("not found", empty answers) expire sooner.
+DEFAULT_TTLS = {
+    "username": 6 * 3600,
+    "email": 24 * 3600,
+    ("domain", "whois"): 24 * 3600,
+    ("domain", "whois-server"): 7 * 24 * 3600,
+    ("domain", "crtsh"): 12 * 3600,
+    ("domain", "ssl"): 12 * 3600,
+    ("domain", "headers"): 6 * 3600,
+    ("domain", "robots"): 12 * 3600,
+    "domain": 6 * 3600,
+}
+DEFAULT_TTL = 3600
+NEGATIVE_TTL = 3600
+ACCESS_BATCH = 256          # cache hits whose access times are written together
+
+MISS = object()
+
+
+# ---------------------------
+#  Result Cache
+# ---------------------------
+class ResultCache:
+    """SQLite-backed TTL cache keyed by (module, source, target) with LRU eviction."""
+
+    def __init__(self, path=CACHE_FILE, max_entries=MAX_ENTRIES, ttls=None,
+                 negative_ttl=NEGATIVE_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.negative_ttl = negative_ttl
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._size = None
+        self._accessed = {}
+
+    def _connect(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " module TEXT, source TEXT, target TEXT, value TEXT,"
+                " expires REAL, accessed REAL,"
+                " PRIMARY KEY (module, source, target))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+            self._size = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def ttl_for(self, module, source, negative=False):
+        if negative:
+            return min(self.negative_ttl, self.ttl_for(module, source))
+        return self.ttls.get((module, source), self.ttls.get(module, DEFAULT_TTL))
+
+    def get(self, module, source, target):
+        """Return the cached value, or MISS if absent, expired or disabled."""
+        if not self.enabled:
+            return MISS
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, expires FROM cache WHERE module=? AND source=? AND target=?",
+                (module, source, target),
+            ).fetchone()
+            if row is None or row[1] < now:
+                self.misses += 1
+                return MISS
+            self.hits += 1
+            # Access times only order LRU eviction, so hits are written in batches
+            self._accessed[(module, source, target)] = now
+            if len(self._accessed) >= ACCESS_BATCH:
+                self._flush_accessed(conn)
+                conn.commit()
+        return json.loads(row[0])
+
+    def _flush_accessed(self, conn):
+        if self._accessed:
+            conn.executemany(
+                "UPDATE cache SET accessed=? WHERE module=? AND source=? AND target=?",
+                [(at, *key) for key, at in self._accessed.items()],
+            )
+            self._accessed = {}
+
+    def set(self, module, source, target, value, negative=False):
+        if not self.enabled:
+            return
+        now = time.time()
+        expires = now + self.ttl_for(module, source, negative)
+        with self._lock:
+            conn = self._connect()
+            exists = conn.execute(
+                "SELECT 1 FROM cache WHERE module=? AND source=? AND target=?",
+                (module, source, target),
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                (module, source, target, json.dumps(value, default=str), expires, now),
+            )
+            if not exists:
+                self._size += 1
+            self._flush_accessed(conn)
+            if self._size > self.max_entries:
+                self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        # Drop expired rows first, then the least recently used 10% over the cap
+        conn.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+        size = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        excess = size - int(self.max_entries * 0.9)
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM cache WHERE rowid IN"
+                " (SELECT rowid FROM cache ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+            size -= excess
+        self._size = size
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM cache")
+            conn.commit()
+            self._size = 0
+            self._accessed = {}
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+_cache = ResultCache()
+
+
+def get_cache():
+    return _cache
+
+
+def set_enabled(enabled):
+    """Turn the shared cache on or off (the --no-cache flag)."""
+    _cache.enabled = enabled
+
+
+def cached(module, source, skip=None, refresh=None):
+    """Cache a blocking lookup ``fn(target, ...)`` under (module, source, target).
+
+    Falsy results are cached with the negative TTL; results for which
+    ``skip(result)`` is true are never stored, so a lookup that failed is
+    retried instead of being remembered as a negative. Calls for which
+    ``refresh(*args, **kwargs)`` is true always reach the source (e.g. a
+    re-scan revalidating with conditional requests) and update the entry.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(target, *args, **kwargs):
+            value = MISS if refresh and refresh(*args, **kwargs) else _cache.get(module, source, target)
+            if value is not MISS:
+                return value
+            value = fn(target, *args, **kwargs)
+            if not (skip and skip(value)):
+                _cache.set(module, source, target, value, negative=not value)
+            return value
+        return wrapper
+    return decorator
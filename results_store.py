@@ -0,0 +1,170 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+STORE_FILE = "osint_results.db"
+BATCH_SIZE = 500            # rows per transaction when recording bulk runs
+
+
+def _timestamp(value):
+    """Epoch seconds from a datetime, an ISO string or a number (None passes through)."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+# ---------------------------
+#  Results Store
+# ---------------------------
+class ResultsStore:
+    """Append-only SQLite log of every scan: (module, target, time, payload).
+
+    Rows are never updated or deleted, so history across runs is kept and
+    reports can cover any target, module or time range.
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scans ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " module TEXT NOT NULL, target TEXT NOT NULL,"
+                " taken_at REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS scans_target ON scans (target, taken_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS scans_module ON scans (module, taken_at)")
+            self._conn = conn
+        return self._conn
+
+    def record(self, module, target, payload):
+        """Append one scan result; returns its row id."""
+        with self._lock:
+            conn = self._connect()
+            cur = conn.execute(
+                "INSERT INTO scans (module, target, taken_at, payload) VALUES (?, ?, ?, ?)",
+                (module, target.lower(), time.time(), json.dumps(payload, default=str)),
+            )
+            conn.commit()
+        return cur.lastrowid
+
+    def record_many(self, module, items):
+        """Append ``(target, payload)`` or ``(target, payload, taken_at)`` items in one transaction.
+
+        Items without a time are stamped with the time of the call.
+        """
+        now = time.time()
+        rows = [(module, target.lower(), _timestamp(rest[0]) if rest else now,
+                 json.dumps(payload, default=str))
+                for target, payload, *rest in items]
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT INTO scans (module, target, taken_at, payload) VALUES (?, ?, ?, ?)", rows
+            )
+            conn.commit()
+        return len(rows)
+
+    @contextmanager
+    def writer(self, module, batch_size=BATCH_SIZE):
+        """Context manager yielding ``add(target, payload)`` that commits in batches.
+
+        Each row keeps the time it was added, not the time its batch was written.
+        """
+        pending = []
+
+        def add(target, payload):
+            pending.append((target, payload, time.time()))
+            if len(pending) >= batch_size:
+                self.record_many(module, pending)
+                pending.clear()
+
+        try:
+            yield add
+        finally:
+            if pending:
+                self.record_many(module, pending)
+
+    def query(self, module=None, target=None, since=None, until=None, limit=None,
+              newest_first=True):
+        """Yield stored scans matching every filter given, newest first by default.
+
+        ``since`` and ``until`` take datetimes, ISO strings or epoch seconds.
+        Rows are read lazily, so large histories can be streamed into a report.
+        """
+        clauses, params = [], []
+        for column, op, value in (("module", "=", module), ("target", "=", target and target.lower()),
+                                  ("taken_at", ">=", _timestamp(since)),
+                                  ("taken_at", "<", _timestamp(until))):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        sql = "SELECT id, module, target, taken_at, payload FROM scans"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY taken_at DESC, id DESC" if newest_first else " ORDER BY taken_at, id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            self._connect()
+        # A separate connection per query keeps a long read from holding the lock
+        conn = sqlite3.connect(self.path)
+        try:
+            for row_id, row_module, row_target, taken_at, payload in conn.execute(sql, params):
+                yield {
+                    "id": row_id,
+                    "module": row_module,
+                    "target": row_target,
+                    "taken_at": datetime.fromtimestamp(taken_at).isoformat(),
+                    "payload": json.loads(payload),
+                }
+        finally:
+            conn.close()
+
+    def latest(self, module=None, target=None):
+        """The most recent matching scan, or None."""
+        rows = self.query(module, target, limit=1)
+        try:
+            return next(rows, None)
+        finally:
+            rows.close()
+
+    def count(self, module=None):
+        with self._lock:
+            conn = self._connect()
+            if module:
+                return conn.execute("SELECT COUNT(*) FROM scans WHERE module=?", (module,)).fetchone()[0]
+            return conn.execute("SELECT COUNT(*) FROM scans").fetchone()[0]
+
+
+_store = ResultsStore()
+
+
+def get_store():
+    return _store
+
+
+def record(module, target, payload):
+    return _store.record(module, target, payload)
+
+
+def query(**filters):
+    return _store.query(**filters)
+
+
+def latest(module=None, target=None):
+    return _store.latest(module, target)
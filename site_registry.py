@@ -0,0 +1,84 @@
+import json
+import os
+import re
+
+DEFAULT_REGISTRY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sites.json")
+
+# Match kinds, strongest first: a block page beats a profile marker,
+# and a profile marker beats a generic "not found" phrase.
+BLOCKED = "blocked"
+FOUND = "found"
+NOT_FOUND = "not_found"
+KINDS = (BLOCKED, FOUND, NOT_FOUND)
+
+_MATCHER_CACHE = {}
+
+
+# ---------------------------
+#  Site Signature
+# ---------------------------
+class SiteSignature:
+    """One platform's URL template, status rules, body patterns and byte budget."""
+
+    def __init__(self, name, url, method="GET", found_status=(), not_found_status=(404,),
+                 found_patterns=(), not_found_patterns=(), block_patterns=(),
+                 max_bytes=65536, rate=None):
+        self.name = name
+        self.url = url
+        self.method = method.upper()
+        self.found_status = frozenset(found_status)
+        self.not_found_status = frozenset(not_found_status)
+        self.found_patterns = tuple(found_patterns)
+        self.max_bytes = int(max_bytes)
+        self.rate = rate
+        self.matcher, self.overlap = compile_matcher(
+            block_patterns, self.found_patterns, not_found_patterns
+        )
+
+    def format(self, username):
+        return self.url.format(username)
+
+    def scan(self, text):
+        """Return the set of match kinds present in ``text``, in one regex pass."""
+        return {m.lastgroup for m in self.matcher.finditer(text)}
+
+
+def compile_matcher(block_patterns, found_patterns, not_found_patterns):
+    """Compile every pattern of a site into one case-insensitive alternation.
+
+    Sites with identical pattern sets share the compiled object, so most of
+    the registry reuses the same matcher built from the defaults.
+    """
+    groups = tuple(zip(KINDS, (tuple(block_patterns), tuple(found_patterns),
+                               tuple(not_found_patterns))))
+    if groups not in _MATCHER_CACHE:
+        alternatives = [
+            f"(?P<{kind}>{'|'.join(f'(?:{p})' for p in patterns)})"
+            for kind, patterns in groups if patterns
+        ]
+        pattern = re.compile("|".join(alternatives) or r"(?!)", re.IGNORECASE)
+        overlap = max((len(p) for _, patterns in groups for p in patterns), default=1)
+        _MATCHER_CACHE[groups] = (pattern, overlap)
+    return _MATCHER_CACHE[groups]
+
+
+# ---------------------------
+#  Loading
+# ---------------------------
+def _read_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yml", ".yaml")):
+            import yaml
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def load_registry(path=DEFAULT_REGISTRY):
+    """Load a JSON (or YAML, if PyYAML is installed) registry into name -> SiteSignature."""
+    data = _read_file(path)
+    defaults = data.get("defaults", {})
+    registry = {}
+    for entry in data.get("sites", []):
+        spec = {**defaults, **entry}
+        registry[spec["name"]] = SiteSignature(**spec)
+    return registry
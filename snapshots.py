@@ -0,0 +1,143 @@
+import json
+import os
+import re
+from datetime import datetime
+from colorama import Fore, Style
+from modules import domain_info, results_store, username_check
+
+SNAPSHOT_DIR = "snapshots"
+
+
+# ---------------------------
+#  Snapshot Storage
+# ---------------------------
+def _target_dir(module, target):
+    safe = re.sub(r"[^\w.@-]", "_", target.lower())
+    return os.path.join(SNAPSHOT_DIR, module, safe)
+
+
+def latest(module, target):
+    """Most recent snapshot for (module, target), or None."""
+    folder = _target_dir(module, target)
+    if not os.path.isdir(folder):
+        return None
+    names = sorted(n for n in os.listdir(folder) if n.endswith(".json"))
+    if not names:
+        return None
+    with open(os.path.join(folder, names[-1]), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save(module, target, results, state=None):
+    """Write a timestamped snapshot next to the target's earlier ones."""
+    now = datetime.utcnow()
+    snapshot = {
+        "module": module,
+        "target": target,
+        "taken_at": now.isoformat(),
+        "results": results,
+        "state": state or {},
+    }
+    folder = _target_dir(module, target)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, now.strftime("%Y%m%dT%H%M%S%fZ") + ".json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=4, default=str)
+    return snapshot
+
+
+# ---------------------------
+#  Diffing
+# ---------------------------
+def _comparable(module, results):
+    """Reduce results to {section: [lines]} so runs can be compared line by line."""
+    if module == "username":
+        states = {}
+        for p in results.get("profiles", []):
+            found = p.get("found")
+            states[p["platform"]] = ["found" if found else "unknown" if found is None else "not found"]
+        return states
+    return {key: str(value).splitlines() for key, value in results.items()}
+
+
+def diff(module, old, new):
+    """Per-section added/removed lines between two result sets; unchanged sections are left out."""
+    old, new = _comparable(module, old), _comparable(module, new)
+    changes = {}
+    for section in list(old) + [s for s in new if s not in old]:
+        before = old.get(section, [])
+        after = new.get(section, [])
+        before_set, after_set = set(before), set(after)
+        added = [line for line in after if line not in before_set]
+        removed = [line for line in before if line not in after_set]
+        if added or removed:
+            changes[section] = {"added": added, "removed": removed}
+    return changes
+
+
+def format_diff(result):
+    if result["previous"] is None:
+        return f"First snapshot for {result['target']} — nothing to compare."
+    if not result["changes"]:
+        return f"No changes for {result['target']} since {result['previous']}."
+    lines = [f"Changes for {result['target']} since {result['previous']}:"]
+    for section, change in result["changes"].items():
+        lines.append(f"[{section}]")
+        lines += [f"  + {line}" for line in change["added"]]
+        lines += [f"  - {line}" for line in change["removed"]]
+    return "\n".join(lines)
+
+
+# ---------------------------
+#  Re-scans
+# ---------------------------
+def _rescan(module, target, run):
+    previous = latest(module, target)
+    state = dict(previous["state"]) if previous else {}
+    results = run(state)
+    results_store.record(module, target, results)
+    snapshot = save(module, target, results, state)
+    return {
+        "module": module,
+        "target": target,
+        "taken_at": snapshot["taken_at"],
+        "previous": previous["taken_at"] if previous else None,
+        "changes": diff(module, previous["results"], results) if previous else None,
+    }
+
+
+def rescan_domain(domain, quiet=True):
+    """Re-run domain recon, revalidating robots/sitemap and crt.sh against the last snapshot."""
+    return _rescan("domain", domain, lambda state: domain_info.domain_recon(domain, quiet, state))
+
+
+def rescan_username(username):
+    return _rescan("username", username, lambda state: username_check.search_username(username))
+
+
+def load_watchlist(path):
+    """(domains, usernames) from a file of "domain example.com" / "username alice" lines."""
+    targets = {"domain": [], "username": []}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            module, _, target = line.partition(" ")
+            if module not in targets or not target.strip():
+                raise ValueError(f"Bad watchlist line: {line}")
+            targets[module].append(target.strip())
+    return targets["domain"], targets["username"]
+
+
+def rescan_watchlist(domains=(), usernames=()):
+    """Re-scan every target and print only what changed."""
+    results = []
+    for domain in domains:
+        results.append(rescan_domain(domain))
+    for username in usernames:
+        results.append(rescan_username(username))
+    for result in results:
+        colour = Fore.YELLOW if result["changes"] else Fore.GREEN
+        print(f"{colour}{format_diff(result)}{Style.RESET_ALL}\n")
+    return results
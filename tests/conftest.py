@@ -0,0 +1,10 @@
+import os
+import sys
+import types
+
+# The code imports itself as the "modules" package; map it onto this checkout.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if "modules" not in sys.modules:
+    package = types.ModuleType("modules")
+    package.__path__ = [ROOT]
+    sys.modules["modules"] = package
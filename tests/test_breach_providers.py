@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from modules import email_breach, result_cache
+
+
+@pytest.fixture(autouse=True)
+def no_cache():
+    result_cache.set_enabled(False)
+    yield
+    result_cache.set_enabled(True)
+
+
+async def fast(request):
+    return web.json_response({"success": True, "found": 1, "fields": ["email"],
+                              "sources": [{"name": "Fast", "date": "2020-01"}]})
+
+
+async def slow(request):
+    await asyncio.sleep(3)
+    return await fast(request)
+
+
+async def down(request):
+    return web.Response(status=503, headers={"Retry-After": "20"})
+
+
+async def serve(handler):
+    app = web.Application()
+    app.router.add_get("/check", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/check"
+
+
+async def check(handlers, **limits):
+    runners, providers = [], []
+    for name, handler in handlers.items():
+        runner, url = await serve(handler)
+        runners.append(runner)
+        providers.append(email_breach.HttpProvider(name, url, rate=100, **limits))
+    try:
+        started = time.monotonic()
+        result = await email_breach.lookup_all_async("hit@a.com", providers)
+        return result, time.monotonic() - started
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+def test_down_provider_is_cut_off_by_its_budget():
+    result, elapsed = asyncio.run(check({"fast": fast, "down": down}, budget=1))
+    assert elapsed < 3
+    assert result["status"] == "found"
+    assert result["providers"] == {"fast": "found", "down": "timeout"}
+
+
+def test_slow_provider_is_cut_off_by_its_deadline():
+    result, elapsed = asyncio.run(check({"fast": fast, "slow": slow, "down": down},
+                                        deadline=1, hedge_after=None, budget=2))
+    assert elapsed < 4
+    assert result["providers"] == {"fast": "found", "slow": "timeout", "down": "timeout"}
+    assert result["sources"] == [{"name": "Fast", "date": "2020-01"}]
+
+
+def test_slow_first_answer_is_hedged():
+    calls = []
+
+    async def slow_once(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(3)
+        return await fast(request)
+
+    result, elapsed = asyncio.run(check({"slow_once": slow_once}, hedge_after=0.2))
+    assert elapsed < 2
+    assert result["providers"] == {"slow_once": "found"}
+    assert len(calls) == 2
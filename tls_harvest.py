@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import ssl
+
+from modules import dns_cache
+
+TLS_CONCURRENCY = 100
+TLS_TIMEOUT = 5
+TLS_PORT = 443
+
+
+# ---------------------------
+#  Certificate Parsing
+# ---------------------------
+def _name_to_dict(name):
+    return dict(x[0] for x in name) if name else None
+
+
+def describe_certificate(der, peer_dict=None):
+    """Summarise a DER certificate: subject, issuer, SANs, validity and key type.
+
+    Uses the optional ``cryptography`` package when installed. Without it the
+    fields come from the ssl module's decoded dict, which is only available
+    for verified connections and carries no key type.
+    """
+    info = {
+        "fingerprint_sha256": hashlib.sha256(der).hexdigest(),
+        "subject": None,
+        "issuer": None,
+        "sans": [],
+        "not_before": None,
+        "not_after": None,
+        "key_type": None,
+        "serial": None,
+    }
+    try:
+        from cryptography import x509
+        from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+        cert = x509.load_der_x509_certificate(der)
+        info["subject"] = cert.subject.rfc4514_string()
+        info["issuer"] = cert.issuer.rfc4514_string()
+        try:
+            san = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName)
+            info["sans"] = san.value.get_values_for_type(x509.DNSName)
+        except x509.ExtensionNotFound:
+            pass
+        not_before = getattr(cert, "not_valid_before_utc", None) or cert.not_valid_before
+        not_after = getattr(cert, "not_valid_after_utc", None) or cert.not_valid_after
+        info["not_before"] = not_before.isoformat()
+        info["not_after"] = not_after.isoformat()
+        info["serial"] = format(cert.serial_number, "x")
+        key = cert.public_key()
+        if isinstance(key, rsa.RSAPublicKey):
+            info["key_type"] = f"RSA-{key.key_size}"
+        elif isinstance(key, ec.EllipticCurvePublicKey):
+            info["key_type"] = f"EC-{key.curve.name}"
+        else:
+            info["key_type"] = type(key).__name__.lstrip("_")
+    except ImportError:
+        if peer_dict:
+            info["subject"] = _name_to_dict(peer_dict.get("subject"))
+            info["issuer"] = _name_to_dict(peer_dict.get("issuer"))
+            info["sans"] = [v for k, v in peer_dict.get("subjectAltName", ()) if k == "DNS"]
+            info["not_before"] = peer_dict.get("notBefore")
+            info["not_after"] = peer_dict.get("notAfter")
+            info["serial"] = peer_dict.get("serialNumber")
+    return info
+
+
+# ---------------------------
+#  Handshake
+# ---------------------------
+async def _handshake(ip, host, port, context, timeout):
+    _, writer = await asyncio.wait_for(
+        asyncio.open_connection(ip, port, ssl=context, server_hostname=host), timeout
+    )
+    try:
+        sslobj = writer.get_extra_info("ssl_object")
+        leaf = sslobj.getpeercert(binary_form=True)
+        peer_dict = sslobj.getpeercert() if context.verify_mode != ssl.CERT_NONE else None
+        # Full chain needs Python 3.13+; older versions only expose the leaf
+        get_chain = getattr(sslobj, "get_unverified_chain", None)
+        chain = list(get_chain() or []) if get_chain else [leaf]
+    finally:
+        writer.close()
+    return leaf, peer_dict, chain
+
+
+async def fetch_certificate(host, port=TLS_PORT, timeout=TLS_TIMEOUT):
+    """Handshake with ``host`` and describe its certificate and chain.
+
+    Tries a verifying handshake first; certificates that fail verification
+    are still harvested over an unverified one and flagged.
+    """
+    addresses = await dns_cache.aresolve(host, "A") or await dns_cache.aresolve(host, "AAAA")
+    if not addresses:
+        raise OSError(f"Could not resolve {host}")
+
+    verified = True
+    verify_error = None
+    try:
+        leaf, peer_dict, chain = await _handshake(
+            addresses[0], host, port, ssl.create_default_context(), timeout
+        )
+    except ssl.SSLCertVerificationError as e:
+        verified = False
+        verify_error = e.verify_message
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        leaf, peer_dict, chain = await _handshake(addresses[0], host, port, context, timeout)
+
+    info = describe_certificate(leaf, peer_dict)
+    info["verified"] = verified
+    if verify_error:
+        info["verify_error"] = verify_error
+    info["chain"] = [
+        {k: c[k] for k in ("fingerprint_sha256", "subject", "issuer", "not_after")}
+        for c in (describe_certificate(der) for der in chain[1:])
+    ]
+    return info
+
+
+# ---------------------------
+#  Concurrent Harvest
+# ---------------------------
+async def iter_certificates(hosts, concurrency=TLS_CONCURRENCY, timeout=TLS_TIMEOUT):
+    """Yield ``(host, info, error)`` for each host as its handshake finishes."""
+    hosts = iter(hosts)
+    out = asyncio.Queue(maxsize=concurrency)
+
+    async def worker():
+        for host in hosts:
+            try:
+                info = await asyncio.wait_for(fetch_certificate(host, timeout=timeout), timeout * 3)
+                await out.put((host, info, None))
+            except Exception as e:
+                await out.put((host, None, str(e) or type(e).__name__))
+
+    async def run():
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        await out.put(None)
+
+    runner = asyncio.create_task(run())
+    try:
+        while True:
+            item = await out.get()
+            if item is None:
+                break
+            yield item
+    finally:
+        runner.cancel()
+
+
+async def harvest_async(hosts, concurrency=TLS_CONCURRENCY, timeout=TLS_TIMEOUT, deadline=None):
+    """Harvest certificates from many hosts, de-duplicated by SHA-256 fingerprint.
+
+    Returns {"certificates": {fingerprint: info + hosts}, "hosts": {host: fingerprint},
+    "errors": {host: message}}.
+    """
+    result = {"certificates": {}, "hosts": {}, "errors": {}}
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + deadline if deadline else None
+    stream = iter_certificates(hosts, concurrency, timeout)
+    try:
+        async for host, info, error in stream:
+            if error:
+                result["errors"][host] = error
+            else:
+                fingerprint = info["fingerprint_sha256"]
+                entry = result["certificates"].setdefault(fingerprint, {**info, "hosts": []})
+                entry["hosts"].append(host)
+                result["hosts"][host] = fingerprint
+            if stop_at and loop.time() > stop_at:
+                break
+    finally:
+        await stream.aclose()
+    return result
+
+
+def harvest(hosts, **kwargs):
+    return asyncio.run(harvest_async(hosts, **kwargs))
+
+
+def get_certificate(host, port=TLS_PORT, timeout=TLS_TIMEOUT):
+    return asyncio.run(fetch_certificate(host, port, timeout))
@@ -1,8 +1,13 @@
 import aiohttp
 import asyncio
+import codecs
 import random
+import sys
+import time
 from colorama import Fore, Style, init
 from modules import report_generator
+from modules import dns_cache, probe_trace, result_cache, results_store, site_registry
+from modules.rate_limit import RateLimitScheduler, parse_retry_after
 
 # Initialize colorama
 init(autoreset=True)
@@ -10,25 +15,10 @@ init(autoreset=True)
 # ============================
 #          SITES LIST
 # ============================
-SITES = {
-    "GitHub": "https://github.com/{}",
-    "GitLab": "https://gitlab.com/{}", 
-    "LeetCode": "https://leetcode.com/{}",
-    "Kaggle": "https://www.kaggle.com/{}",
-    "TryHackMe": "https://tryhackme.com/p/{}",
-    "HackTheBox": "https://app.hackthebox.com/profile/{}",
-    "Replit": "https://replit.com/@{}",  
-    "Twitter / X": "https://x.com/{}",
-    "Reddit": "https://www.reddit.com/user/{}",
-    "YouTube": "https://www.youtube.com/@{}",
-    "Twitch": "https://www.twitch.tv/{}",
-    "Facebook": "https://www.facebook.com/{}",
-    "LinkedIn": "https://www.linkedin.com/in/{}",  
-    "Roblox": "https://www.roblox.com/user.aspx?username={}",
-    "Minecraft": "https://namemc.com/profile/{}",
-    "Chess.com": "https://www.chess.com/member/{}",  
-    "Keybase": "https://keybase.io/{}",
-}
+# Signatures (URL, status rules, patterns, byte budget, rate) live in
+# sites.json; SITES keeps the plain name -> URL template view.
+REGISTRY = site_registry.load_registry()
+SITES = {name: site.url for name, site in REGISTRY.items()}
 
 # ============================
 #      USER AGENTS
@@ -40,131 +30,413 @@ USER_AGENTS = [
 ]
 
 # ============================
-#      NOT FOUND KEYWORDS
+#      RESPONSE HANDLING
 # ============================
-NOT_FOUND_KEYWORDS = [
-    "page not found",
-    "not found",
-    "does not exist",
-    "no such",
-    "unavailable",
-    "user not found",
-    "sorry, this",
-]
+THROTTLE_STATUSES = {429, 503}
+TRANSIENT_STATUSES = {500, 502, 504}
+CHUNK_SIZE = 8192
+
+# ============================
+#      CONNECTION SETTINGS
+# ============================
+REQUEST_TIMEOUT = 15
+BULK_CONCURRENCY = 50     # checks in flight at once across all hosts
+LIMIT_PER_HOST = 4        # open connections per platform host
+
+
+def create_session(concurrency=BULK_CONCURRENCY, limit_per_host=LIMIT_PER_HOST):
+    """Build a keep-alive session whose connector caps total and per-host connections.
+
+    Names resolve through the shared dns_cache resolver, which honours record
+    TTLs, so the connector's own fixed-TTL host cache is turned off.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=concurrency,
+        limit_per_host=limit_per_host,
+        resolver=dns_cache.AiohttpResolver(),
+        use_dns_cache=False,
+    )
+    return aiohttp.ClientSession(connector=connector,
+                                 trace_configs=[probe_trace.create_trace_config()])
+
+
+def create_scheduler(**kwargs):
+    """Per-run scheduler holding one token bucket per platform in SITES."""
+    rates = {name: site.rate for name, site in REGISTRY.items() if site.rate}
+    return RateLimitScheduler(rates=rates, **kwargs)
 
 # ============================
 #      SINGLE SITE CHECK
 # ============================
-async def check_single_site(session, username, platform, url):
+async def inspect_body(response, site):
+    """Stream the body until a decisive match or the site's byte budget.
+
+    Returns "found", "not_found", "blocked", or None if nothing matched.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    # Keep the end of the previous chunk so patterns split across chunks still match
+    tail = ""
+    read = 0
+    not_found = False
+
+    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+        chunk = chunk[:site.max_bytes - read]
+        read += len(chunk)
+        window = tail + decoder.decode(chunk)
+        kinds = site.scan(window)
+
+        if site_registry.BLOCKED in kinds:
+            return site_registry.BLOCKED
+        if site_registry.FOUND in kinds:
+            return site_registry.FOUND
+        if site_registry.NOT_FOUND in kinds:
+            if not site.found_patterns:
+                return site_registry.NOT_FOUND
+            not_found = True
+
+        if read >= site.max_bytes:
+            break
+        tail = window[-site.overlap:]
+
+    return site_registry.NOT_FOUND if not_found else None
+
+
+async def check_single_site(session, username, platform, url, scheduler=None, probe=None,
+                            timeout=REQUEST_TIMEOUT):
+    """Probe one platform; ``exists`` is None when throttling or errors left it undecided.
+
+    ``probe`` (see probe_trace.new_probe) receives the outcome and phase timings;
+    ``timeout`` bounds each request in seconds.
+    """
+    probe = probe if probe is not None else probe_trace.new_probe()
+    cache = result_cache.get_cache()
+    exists = cache.get("username", platform, username)
+    if exists is not result_cache.MISS:
+        probe_trace.finish_probe(probe, "cached")
+        return platform, exists, url if exists else None
+
+    platform, exists, url = await probe_site(session, username, platform, url, scheduler, probe, timeout)
+    if exists is not None:
+        cache.set("username", platform, username, exists, negative=not exists)
+    return platform, exists, url
+
+
+async def probe_site(session, username, platform, url, scheduler, probe, timeout=REQUEST_TIMEOUT):
+    scheduler = scheduler or create_scheduler()
     headers = {
         "User-Agent": random.choice(USER_AGENTS),
         "Accept-Language": "en-US,en;q=0.9",
         "Accept": "*/*",
         "Referer": "https://www.google.com/",
     }
+    site = REGISTRY[platform]
+    method = site.method
 
-    try:
-        async with session.get(url, headers=headers, timeout=15) as response:
-            text = (await response.text()).lower()
-            status = response.status
-
-            # Special platform rules
-            if platform == "Reddit" and "reddit.com/user" in text:
-                return platform, True, url
-            if platform == "YouTube" and ("channel" in text or "videocount" in text):
-                return platform, True, url
-            if platform == "Twitter / X" and ("followers" in text or "following" in text):
-                return platform, True, url
-            if platform == "LinkedIn" and "public-profile" in text:
-                return platform, True, url
-
-            # 404 check
-            if status == 404:
-                return platform, False, None
-
-            # Keyword-based NOT FOUND
-            for key in NOT_FOUND_KEYWORDS:
-                if key in text:
+    attempt = 0
+    while True:
+        await scheduler.acquire(platform, attempt)
+        retry_after = None
+        throttled = False
+
+        try:
+            async with session.request(method, url, headers=headers, timeout=timeout,
+                                       trace_request_ctx=probe) as response:
+                status = response.status
+
+                if status in THROTTLE_STATUSES:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    throttled = True
+                    probe_trace.finish_probe(probe, "throttled", status)
+                elif status in TRANSIENT_STATUSES:
+                    probe_trace.finish_probe(probe, "http_error", status)
+                elif status in site.found_status:
+                    scheduler.succeeded(platform)
+                    probe_trace.finish_probe(probe, "status", status, "found_status")
+                    return platform, True, url
+                elif status in site.not_found_status and not site.found_patterns:
+                    scheduler.succeeded(platform)
+                    probe_trace.finish_probe(probe, "status", status, "not_found_status")
                     return platform, False, None
+                elif method == "HEAD":
+                    # Status was not decisive: inspect the page instead
+                    method = "GET"
+                    continue
+                else:
+                    verdict = await inspect_body(response, site)
+                    if verdict == site_registry.BLOCKED:
+                        throttled = True
+                        probe_trace.finish_probe(probe, "throttled", status, verdict)
+                    else:
+                        scheduler.succeeded(platform)
+                        if verdict == site_registry.FOUND:
+                            probe_trace.finish_probe(probe, "matched", status, verdict)
+                            return platform, True, url
+                        if verdict == site_registry.NOT_FOUND:
+                            probe_trace.finish_probe(probe, "matched", status, verdict)
+                            return platform, False, None
+                        if status in site.not_found_status:
+                            probe_trace.finish_probe(probe, "status", status, "not_found_status")
+                            return platform, False, None
+                        # Assume exists
+                        probe_trace.finish_probe(probe, "status", status, "default")
+                        return platform, True, url
 
-            # Assume exists
-            return platform, True, url
+        except asyncio.TimeoutError:
+            probe_trace.finish_probe(probe, "timeout")
+        except aiohttp.ClientError as e:
+            probe_trace.finish_probe(probe, "connection_error", rule=type(e).__name__)
+        except Exception as e:
+            probe_trace.finish_probe(probe, "error", rule=type(e).__name__)
+            return platform, None, None
 
-    except:
-        return platform, False, None
+        if not scheduler.can_retry(attempt):
+            return platform, None, None
+        await scheduler.retry_wait(platform, attempt, retry_after, throttled)
+        attempt += 1
 
 # ============================
 #      ASYNC SCANNER
 # ============================
-async def search_username_async(username):
-    print(f"\n🔍 Scanning username: {Fore.CYAN}{username}{Style.RESET_ALL}\n")
+# Phase histograms and outcome counts for every probe made by this process
+PROBE_STATS = probe_trace.ProbeStats()
 
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            check_single_site(session, username, platform, url.format(username))
-            for platform, url in SITES.items()
-        ]
-        results = await asyncio.gather(*tasks)
 
-    profiles = []
-    found_count = 0
-    formatted_profiles = ""
+async def iter_username_results(username, session=None, scheduler=None):
+    """Yield ``(platform, exists, url, probe)`` for each site as soon as it answers."""
+    scheduler = scheduler or create_scheduler()
+    if session is None:
+        async with create_session(concurrency=len(SITES)) as session:
+            async for item in iter_username_results(username, session, scheduler):
+                yield item
+        return
+
+    probes = {platform: probe_trace.new_probe() for platform in SITES}
+    tasks = [
+        asyncio.ensure_future(check_single_site(
+            session, username, platform, url.format(username), scheduler, probes[platform]
+        ))
+        for platform, url in SITES.items()
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            platform, exists, url = await next_done
+            PROBE_STATS.record(platform, probes[platform])
+            yield platform, exists, url, probes[platform]
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def search_username_async(username, collector=None):
+    print(f"\n🔍 Scanning username: {Fore.CYAN}{username}{Style.RESET_ALL}\n")
+
+    username_result = {
+        "searched_username": username,
+        "total_found": 0,
+        "profiles": []
+    }
 
     # Terminal print
-    for platform, exists, url in results:
-        profiles.append({
+    async for platform, exists, url, probe in iter_username_results(username):
+        username_result["profiles"].append({
             "platform": platform,
             "found": exists,
-            "url": url if exists else None
+            "url": url if exists else None,
+            "probe": probe
         })
 
         if exists:
             status = f"{Fore.GREEN}✔ FOUND{Style.RESET_ALL}"
-            found_count += 1
+            username_result["total_found"] += 1
+        elif exists is None:
+            status = f"{Fore.YELLOW}⚠ Unknown ({probe['outcome']}){Style.RESET_ALL}"
         else:
             status = f"{Fore.RED}❌ Not Found{Style.RESET_ALL}"
 
         url_display = f": {url}" if url else ""
         print(f"{status} | {platform}{url_display}")
-        formatted_profiles += f"{status} | {platform}{url_display}\n"
 
     print("\n--------------------------------")
-    print(f"Total Profiles Found: {Fore.GREEN}{found_count}{Style.RESET_ALL}")
+    print(f"Total Profiles Found: {Fore.GREEN}{username_result['total_found']}{Style.RESET_ALL}")
     print("\n✅ Recon finished.\n")
 
-    # Build final result
-    username_result = {
-        "searched_username": username,
-        "total_found": found_count,
-        "profiles": profiles
-    }
-
-    # CLEAN REPORT FOR HTML
-    report_text = (
-        f"Searched Username: {username}\n"
-        f"Total Profiles Found: {found_count}\n\n"
-        f"{formatted_profiles}\n"
-    )
-
-    report_generator.add_username_result(
-        {"username": username, "report": report_text},
-        force=True
-    )
-
+    # Added once complete, so report snapshots never hold a half-filled entry
+    report_generator.add_username_result(username_result, collector)
     return username_result
 
 # ============================
 #      WRAPPER FUNCTION
 # ============================
-def search_username(username):
+def search_username(username, collector=None):
+    try:
+        return asyncio.run(search_username_async(username, collector))
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        return loop.run_until_complete(search_username_async(username, collector))
+
+# ============================
+#      BULK SCANNER
+# ============================
+def load_usernames(source):
+    """Yield unique usernames from a file path ('-' for stdin) or an iterable."""
+    if isinstance(source, str):
+        handle = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+        try:
+            yield from _unique_usernames(handle)
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+    else:
+        yield from _unique_usernames(source)
+
+
+def _unique_usernames(lines):
+    seen = set()
+    for line in lines:
+        username = line.strip()
+        if username and username not in seen:
+            seen.add(username)
+            yield username
+
+
+async def iter_usernames_bulk(usernames, concurrency=BULK_CONCURRENCY,
+                             limit_per_host=LIMIT_PER_HOST,
+                             stats=None, timeout=REQUEST_TIMEOUT):
+    """Scan many usernames through one shared session with a global concurrency cap.
+
+    Yields each username's result as soon as all of its sites have answered;
+    ``timeout`` bounds each request in seconds.
+    ``stats``, if given, receives check counts, timing and the run's
+    per-platform probe histogram when the run ends.
+    """
+    order = {platform: i for i, platform in enumerate(SITES)}
+    pending = {}
+    checks = 0
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    done = asyncio.Queue(maxsize=concurrency)
+    run_stats = probe_trace.ProbeStats()
+    start = time.perf_counter()
+
+    scheduler = create_scheduler()
+
+    async with create_session(concurrency, limit_per_host) as session:
+
+        async def worker():
+            nonlocal checks
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                username, platform, url = item
+                probe = probe_trace.new_probe()
+                platform, exists, url = await check_single_site(
+                    session, username, platform, url, scheduler, probe, timeout
+                )
+                checks += 1
+                PROBE_STATS.record(platform, probe)
+                run_stats.record(platform, probe)
+
+                result = pending[username]
+                result["profiles"].append({
+                    "platform": platform,
+                    "found": exists,
+                    "url": url if exists else None,
+                    "probe": probe
+                })
+                if exists:
+                    result["total_found"] += 1
+
+                if len(result["profiles"]) == len(SITES):
+                    del pending[username]
+                    result["profiles"].sort(key=lambda p: order[p["platform"]])
+                    await done.put(result)
+
+        async def produce():
+            error = None
+            try:
+                for username in load_usernames(usernames):
+                    pending[username] = {
+                        "searched_username": username,
+                        "total_found": 0,
+                        "profiles": []
+                    }
+                    for platform, url in SITES.items():
+                        await queue.put((username, platform, url.format(username)))
+            except Exception as e:
+                error = e
+            # Drain the workers before signalling the end, even after an input error
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers, return_exceptions=True)
+            await done.put(None)
+            if error:
+                raise error
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                result = await done.get()
+                if result is None:
+                    break
+                yield result
+            # Re-raise anything the producer hit (e.g. unreadable input file)
+            await producer
+        finally:
+            producer.cancel()
+            for task in workers:
+                task.cancel()
+
+    if stats is not None:
+        elapsed = time.perf_counter() - start
+        stats["checks"] = checks
+        stats["elapsed"] = elapsed
+        stats["checks_per_second"] = checks / elapsed if elapsed > 0 else 0.0
+        stats["histogram"] = run_stats.histogram()
+
+
+async def search_usernames_bulk_async(usernames, on_result=None, keep_results=True, **kwargs):
+    """Run a bulk scan, calling ``on_result`` per username and collecting all results.
+
+    With ``keep_results`` off, results are only passed to ``on_result`` and
+    the results store, so memory stays flat however many usernames run.
+    """
+    results = []
+    scanned = 0
+    stats = {}
+    with results_store.get_store().writer("username") as save:
+        async for result in iter_usernames_bulk(usernames, stats=stats, **kwargs):
+            scanned += 1
+            if keep_results:
+                results.append(result)
+            save(result["searched_username"], result)
+            if on_result:
+                on_result(result)
+
+    print(f"\n⚡ {scanned} usernames, {stats['checks']} checks in {stats['elapsed']:.1f}s "
+          f"({Fore.GREEN}{stats['checks_per_second']:.1f} checks/s{Style.RESET_ALL})\n")
+    if stats["histogram"]:
+        print(f"⏱  Probe timings per platform:\n{probe_trace.format_histogram(stats['histogram'])}\n")
+
+    return {"results": results, **stats}
+
+
+def search_usernames_bulk(usernames, **kwargs):
     try:
-        return asyncio.run(search_username_async(username))
+        return asyncio.run(search_usernames_bulk_async(usernames, **kwargs))
     except RuntimeError:
         loop = asyncio.new_event_loop()
-        return loop.run_until_complete(search_username_async(username))
+        return loop.run_until_complete(search_usernames_bulk_async(usernames, **kwargs))
 
 if __name__ == "__main__":
-    user_input = input("Enter username: ").strip()
-    if user_input:
-        search_username(user_input)
+    if len(sys.argv) > 1:
+        search_usernames_bulk(sys.argv[1])
+    else:
+        user_input = input("Enter username: ").strip()
+        if user_input:
+            search_username(user_input)
 
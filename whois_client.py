@@ -0,0 +1,176 @@
+import asyncio
+import re
+import threading
+import time
+
+from modules import dns_cache, result_cache
+
+IANA_SERVER = "whois.iana.org"
+WHOIS_PORT = 43
+WHOIS_TIMEOUT = 10
+MAX_RESPONSE_BYTES = 256 * 1024
+MAX_REFERRALS = 2
+SERVER_RATE = 1.0           # queries per second to any one WHOIS server
+
+# Seed for the TLD -> server map; anything else is asked of IANA once and cached
+KNOWN_SERVERS = {
+    "com": "whois.verisign-grs.com",
+    "net": "whois.verisign-grs.com",
+    "org": "whois.pir.org",
+    "io": "whois.nic.io",
+    "info": "whois.nic.info",
+}
+
+# Servers that need more than the bare name on the query line
+QUERY_FORMATS = {
+    "whois.verisign-grs.com": "={}\r\n",
+    "whois.denic.de": "-T dn,ace {}\r\n",
+}
+
+REFERRAL_PATTERN = re.compile(
+    r"^\s*(?:registrar whois server|whois server|whois|refer|referralserver)\s*:\s*(?:r?whois://)?([\w.-]+)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Field name in get_whois_info's dict -> WHOIS keys that carry it
+FIELD_PATTERNS = {
+    "Registrar": r"registrar|sponsoring registrar|registrar name",
+    "Creation Date": r"creation date|created|created on|registered on|registration time|domain registration date",
+    "Expiration Date": r"registry expiry date|registrar registration expiration date|expiration date"
+                       r"|expiry date|expires on|expires|paid-till|expire",
+    "Registrant": r"registrant organization|registrant organisation|registrant|org|organisation",
+    "Country": r"registrant country|country",
+    "Name Servers": r"name server|nserver|nameservers?",
+    "Status": r"domain status|status|state",
+}
+MULTI_VALUE_FIELDS = {"Name Servers", "Status"}
+_FIELD_REGEXES = {
+    field: re.compile(rf"^\s*(?:{keys})\s*:\s*(.+?)\s*$", re.IGNORECASE | re.MULTILINE)
+    for field, keys in FIELD_PATTERNS.items()
+}
+
+_tld_servers = dict(KNOWN_SERVERS)
+_next_slot = {}
+_slot_lock = threading.Lock()
+
+
+# ---------------------------
+#  Per-server Rate Limit
+# ---------------------------
+def _reserve_slot(server):
+    """Seconds to wait before querying ``server``; safe across threads and event loops."""
+    with _slot_lock:
+        now = time.monotonic()
+        slot = max(now, _next_slot.get(server, 0.0))
+        _next_slot[server] = slot + 1 / SERVER_RATE
+    return slot - now
+
+
+# ---------------------------
+#  Port 43 Query
+# ---------------------------
+async def query_server(server, query, timeout=WHOIS_TIMEOUT):
+    """Send one WHOIS query and read the reply until EOF or MAX_RESPONSE_BYTES."""
+    await asyncio.sleep(_reserve_slot(server))
+    addresses = await dns_cache.aresolve(server, "A")
+    host = addresses[0] if addresses else server
+
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, WHOIS_PORT), timeout)
+    try:
+        line = QUERY_FORMATS.get(server, "{}\r\n").format(query)
+        writer.write(line.encode("utf-8"))
+        await writer.drain()
+
+        async def read_all():
+            chunks = []
+            size = 0
+            while size < MAX_RESPONSE_BYTES:
+                chunk = await reader.read(8192)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+            return b"".join(chunks)
+
+        data = await asyncio.wait_for(read_all(), timeout)
+    finally:
+        writer.close()
+    return data.decode("utf-8", errors="replace")
+
+
+async def server_for_tld(tld, timeout=WHOIS_TIMEOUT):
+    """WHOIS server for a TLD, from memory, the result cache or IANA."""
+    if tld in _tld_servers:
+        return _tld_servers[tld]
+
+    cache = result_cache.get_cache()
+    server = cache.get("domain", "whois-server", tld)
+    if server is result_cache.MISS:
+        reply = await query_server(IANA_SERVER, tld, timeout)
+        match = REFERRAL_PATTERN.search(reply)
+        server = match.group(1).lower() if match else None
+        if server:
+            cache.set("domain", "whois-server", tld, server)
+    if server:
+        _tld_servers[tld] = server
+    return server
+
+
+def _referral(reply, current):
+    for match in REFERRAL_PATTERN.finditer(reply):
+        server = match.group(1).lower().rstrip(".")
+        if server != current and "." in server:
+            return server
+    return None
+
+
+# ---------------------------
+#  Parsing
+# ---------------------------
+def parse_whois(text):
+    """Pull the common fields out of a WHOIS reply, in get_whois_info's dict shape."""
+    body = "\n".join(line for line in text.splitlines() if not line.lstrip().startswith(("%", "#", ">>>")))
+    parsed = {}
+    for field, regex in _FIELD_REGEXES.items():
+        values = []
+        for value in regex.findall(body):
+            value = value.lower() if field == "Name Servers" else value
+            if value not in values:
+                values.append(value)
+        if field in MULTI_VALUE_FIELDS:
+            parsed[field] = values or "N/A"
+        else:
+            parsed[field] = values[0] if values else "N/A"
+    return parsed
+
+
+async def lookup_async(domain, timeout=WHOIS_TIMEOUT):
+    """Query the registry for ``domain`` and follow registrar referrals."""
+    domain = domain.lower().rstrip(".").encode("idna").decode("ascii")
+    server = await server_for_tld(domain.rsplit(".", 1)[-1], timeout)
+    if not server:
+        raise LookupError(f"No WHOIS server known for {domain}")
+
+    replies = []
+    for _ in range(MAX_REFERRALS + 1):
+        reply = await query_server(server, domain, timeout)
+        replies.append(reply)
+        server = _referral(reply, server)
+        if not server:
+            break
+
+    # Registrar answers are more detailed, so they win over the registry's
+    result = parse_whois(replies[0])
+    for reply in replies[1:]:
+        for field, value in parse_whois(reply).items():
+            if value != "N/A":
+                result[field] = value
+
+    if all(value == "N/A" for value in result.values()):
+        lines = [line for line in replies[-1].splitlines() if line.strip()][:20]
+        return {"raw": "\n".join(lines)}
+    return result
+
+
+def lookup(domain, timeout=WHOIS_TIMEOUT):
+    return asyncio.run(lookup_async(domain, timeout))